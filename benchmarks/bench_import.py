@@ -0,0 +1,78 @@
+"""
+Import-time benchmark for horloadist.
+
+Imports the package in fresh interpreters and reports the wall time of the
+import next to the time of importing numpy and pandas alone. It fails if
+one of the lazily imported heavy modules (matplotlib, scipy) is loaded by
+`import horloadist`, or if the import overhead exceeds `--max-overhead-ms`.
+
+usage:
+    python benchmarks/bench_import.py [--repeat 5] [--max-overhead-ms 100]
+"""
+import argparse
+import subprocess
+import sys
+
+
+LAZY_MODULES = ('matplotlib', 'scipy')
+
+TIMING_SNIPPET = (
+    "import time; t = time.perf_counter(); {stmt}; "
+    "print(time.perf_counter() - t)"
+)
+
+MODULES_SNIPPET = (
+    "import sys; import horloadist; "
+    "print(','.join(m for m in {lazy!r} if m in sys.modules))"
+)
+
+
+def time_import(stmt:str, repeat:int) -> float:
+    timings = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, '-c', TIMING_SNIPPET.format(stmt=stmt)],
+            check=True, capture_output=True, text=True
+            )
+        timings.append(float(out.stdout))
+    return min(timings)
+
+
+def loaded_lazy_modules() -> list[str]:
+    out = subprocess.run(
+        [sys.executable, '-c', MODULES_SNIPPET.format(lazy=LAZY_MODULES)],
+        check=True, capture_output=True, text=True
+        )
+    return [m for m in out.stdout.strip().split(',') if m]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-overhead-ms', type=float, default=None)
+    args = parser.parse_args()
+
+    t_deps = time_import('import numpy, pandas', args.repeat)
+    t_pkg = time_import('import horloadist', args.repeat)
+    overhead_ms = (t_pkg - t_deps) * 1e3
+
+    print(f"import numpy, pandas    : {t_deps*1e3:8.1f} ms")
+    print(f"import horloadist       : {t_pkg*1e3:8.1f} ms")
+    print(f"horloadist overhead     : {overhead_ms:8.1f} ms")
+
+    failed = False
+
+    loaded = loaded_lazy_modules()
+    if loaded:
+        print(f"FAIL: 'import horloadist' loaded {', '.join(loaded)}")
+        failed = True
+
+    if args.max_overhead_ms is not None and overhead_ms > args.max_overhead_ms:
+        print(f"FAIL: overhead above {args.max_overhead_ms:.1f} ms")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""
+Scaling benchmark for Stucture, LinSolve and NonLinSolve.
+
+Generates synthetic floor plans with N walls on a rectangular plate. Walls
+alternate between the x- and y-direction and get constant rectangular
+stiffnesses (`KX.constRectangular`/`KY.constRectangular`); a share of them
+gets a softening moment-stiffness curve shaped like the csv files in
+`examples/stiffness_data`. The curves soften to half the initial stiffness,
+so NonLinSolve converges and its timing measures the solver rather than a
+loop running into the iteration cap; a run that does not converge fails the
+benchmark. Everything is generated in memory, so the benchmark runs offline
+and is reproducible through `--seed`.
+
+For every size the best wall time of `--repeat` runs and the peak traced
+memory of one run are reported for each operation. Results can be stored
+with `--save` and compared with `--compare`, which fails if an operation
+got slower than `--tolerance` times the stored time and by more than
+`--min-delta-ms` (to ignore timer noise on sub-millisecond operations).
+
+usage:
+    python benchmarks/bench_scaling.py --sizes 10 100 1000 10000
+    python benchmarks/bench_scaling.py --save benchmarks/baseline.json
+    python benchmarks/bench_scaling.py --compare benchmarks/baseline.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+import numpy as np
+
+from horloadist import KX, KY, SupportNode, Polygon, Stucture, LinSolve, NonLinSolve
+from horloadist.stiffnesses import StiffnessCurve
+
+
+WALL_LENGTH = 4.0
+WALL_THICKNESS = 0.25
+PLATE_SPACING = 6.0
+
+
+def softening_curve(EI_0:float, mom_ref:float, n_knots:int=200) -> StiffnessCurve:
+    # the knots cover the moments that occur, a linear extrapolation of the
+    # falling branch would reach negative stiffnesses
+    mom = np.linspace(-10*mom_ref, 10*mom_ref, n_knots)
+    EI = EI_0 * (0.5 + 0.5 / (1 + (mom / mom_ref)**2))
+    return StiffnessCurve(mom, EI)
+
+
+def floor_plan(
+        n_walls:int,
+        nonlinear_share:float,
+        seed:int
+        ) -> tuple[list[SupportNode], Polygon]:
+    rng = np.random.default_rng(seed)
+    n_side = int(np.ceil(np.sqrt(n_walls)))
+    width = n_side * PLATE_SPACING
+
+    grid = np.arange(n_side) * PLATE_SPACING + PLATE_SPACING / 2
+    gx, gy = np.meshgrid(grid, grid)
+    xy = np.column_stack((gx.ravel(), gy.ravel()))[:n_walls]
+    xy = xy + rng.uniform(-1, 1, size=xy.shape)
+
+    lengths = WALL_LENGTH * rng.uniform(0.5, 1.5, size=n_walls)
+    nonlinear = rng.random(n_walls) < nonlinear_share
+
+    nodes = []
+    for i, ((x, y), length, nl) in enumerate(zip(xy, lengths, nonlinear)):
+        if i % 2 == 0:
+            dx, dy = length, WALL_THICKNESS
+        else:
+            dx, dy = WALL_THICKNESS, length
+        kx = KX.constRectangular(dx, dy)
+        ky = KY.constRectangular(dx, dy)
+        if nl:
+            if kx > ky:
+                kx = softening_curve(kx, mom_ref=kx/50)
+            else:
+                ky = softening_curve(ky, mom_ref=ky/50)
+        nodes.append(SupportNode(i + 1, x, y, kx, ky))
+
+    plate = Polygon([[0, 0], [width, 0], [width, width], [0, width]])
+    return nodes, plate
+
+
+def measure(
+        setup:Callable[[], object],
+        operation:Callable[[object], object],
+        repeat:int
+        ) -> tuple[float, float]:
+    timings = []
+    for _ in range(repeat):
+        arg = setup()
+        t = time.perf_counter()
+        operation(arg)
+        timings.append(time.perf_counter() - t)
+
+    arg = setup()
+    tracemalloc.start()
+    operation(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(timings), peak / 2**20
+
+
+def bench_size(
+        n_walls:int,
+        nonlinear_share:float,
+        repeat:int,
+        iterations:int,
+        seed:int
+        ) -> dict[str, dict[str, float]]:
+    nodes, plate = floor_plan(n_walls, nonlinear_share, seed)
+    centre = plate.centroid
+    z_heigt = 3.0
+    force = 1e-2 * n_walls
+
+    def structure() -> Stucture:
+        return Stucture(nodes, centre, verbose=False)
+
+    def linsolve() -> LinSolve:
+        return LinSolve(structure(), force, force)
+
+    def nonlinsolve(struc:Stucture) -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            sol = NonLinSolve(
+                struc, force, force,
+                iterations=iterations, z_heigt=z_heigt, verbose=False
+                )
+        if not sol._converged:
+            raise RuntimeError(
+                f"NonLinSolve did not converge for {n_walls} walls within "
+                f"{iterations} iterations"
+                )
+
+    operations = {
+        'Stucture()':(lambda: None, lambda _: structure()),
+        '_result_table':(structure, lambda s: s._result_table),
+        'LinSolve._table':(linsolve, lambda sol: sol._table),
+        'updateNodes':(linsolve, lambda sol: sol.updateNodes()),
+        'NonLinSolve':(structure, nonlinsolve),
+    }
+
+    results = {}
+    for name, (setup, operation) in operations.items():
+        seconds, peak_mib = measure(setup, operation, repeat)
+        results[name] = {'time_s':seconds, 'peak_mib':peak_mib}
+    return results
+
+
+def print_results(results:dict[str, dict[str, dict[str, float]]]) -> None:
+    print(f"{'walls':>7}  {'operation':<16} {'time [ms]':>12} {'peak [MiB]':>11}")
+    for size, operations in results.items():
+        for name, res in operations.items():
+            print(
+                f"{size:>7}  {name:<16} "
+                f"{res['time_s']*1e3:12.3f} {res['peak_mib']:11.2f}"
+                )
+
+
+def compare(
+        results:dict[str, dict[str, dict[str, float]]],
+        baseline:dict[str, dict[str, dict[str, float]]],
+        tolerance:float,
+        min_delta_s:float
+        ) -> list[str]:
+    regressions = []
+    for size, operations in results.items():
+        for name, res in operations.items():
+            ref = baseline.get(size, {}).get(name)
+            if ref is None:
+                continue
+            slower = res['time_s'] > tolerance * ref['time_s']
+            if slower and res['time_s'] - ref['time_s'] > min_delta_s:
+                regressions.append(
+                    f"{size} walls, {name}: {res['time_s']*1e3:.3f} ms "
+                    f"> {tolerance} x {ref['time_s']*1e3:.3f} ms"
+                    )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--nonlinear-share', type=float, default=0.2)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--iterations', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', metavar='JSON')
+    parser.add_argument('--compare', metavar='JSON')
+    parser.add_argument('--tolerance', type=float, default=1.5)
+    parser.add_argument('--min-delta-ms', type=float, default=1.0)
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        results[str(size)] = bench_size(
+            size, args.nonlinear_share, args.repeat, args.iterations, args.seed
+            )
+
+    print_results(results)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(
+            results, baseline, args.tolerance, args.min_delta_ms / 1e3
+            )
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,25 @@
+from horloadist import KX, KY, Polygon, SupportNode, Stucture, Building
+
+# three storeys of the INDET_SIMPLE_main.py floor plan, the walls get
+# thinner over the height and wall 4 ends below the top storey
+
+poly = Polygon([[0, 0], [7, 0], [7, 4], [0, 4]])
+
+def storey(t:float, with_w4:bool=True) -> Stucture:
+    w1 = SupportNode(1, 3.50, 0.00, KX.constRectangular(3.00, t), KY.constRectangular(3.00, t))
+    w2 = SupportNode(2, 7.00, 4.00, KX.constRectangular(t, 2.00), KY.constRectangular(t, 2.00))
+    w3 = SupportNode(3, 6.00, 5.00, KX.constRectangular(2.00, t), KY.constRectangular(2.00, t))
+    w4 = SupportNode(4, 2.00, 4.00, KX.constRectangular(t, 3.00), KY.constRectangular(t, 3.00))
+    nodes = [w1, w2, w3, w4] if with_w4 else [w1, w2, w3]
+    return Stucture(nodes=nodes, glo_mass_centre=poly.centroid, verbose=False)
+
+storeys = [storey(0.30), storey(0.25), storey(0.20, with_w4=False)]
+
+bld = Building(
+    storeys=storeys,
+    storey_heights=[3.0, 3.0, 3.0],
+    x_storey_forces=[1.0, 2.0, 3.0],
+    y_storey_forces=[1.0, 2.0, 3.0],
+    )
+
+bld.printTable()
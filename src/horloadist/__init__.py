@@ -1,6 +1,17 @@
 from .stiffnesses import *
 from .node import *
 from .polygon import *
+from .mass import *
 from .structure import *
 from .linsolve import *
-from .nlsolve import *
\ No newline at end of file
+from .matrix import *
+from .acceleration import *
+from .nlsolve import *
+from .parallel import *
+from .building import *
+from .coupled import *
+from .sweep import *
+from .envelope import *
+from .writer import *
+from .library import *
+from .instrument import *
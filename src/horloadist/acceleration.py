@@ -0,0 +1,212 @@
+import numpy as np
+
+
+class Picard:
+    """
+    Plain fixed-point update of the nonlinear stiffnesses.
+
+    The stiffnesses interpolated from the current moments are taken as they
+    are. This is the behaviour of `NonLinSolve` without acceleration.
+    """
+    def reset(self) -> None:
+        """
+        Forgets all state from a previous run.
+
+        Returns
+        -------
+        None
+        """
+        pass
+
+
+    def update(self, x:np.ndarray, gx:np.ndarray) -> np.ndarray:
+        """
+        Computes the next iterate.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The stiffnesses used in the last linear solve.
+        gx : np.ndarray
+            The stiffnesses interpolated from the resulting moments.
+
+        Returns
+        -------
+        np.ndarray
+            The stiffnesses for the next linear solve.
+        """
+        return gx
+
+
+class Relaxation(Picard):
+    """
+    Constant under-relaxation `x + omega * (g(x) - x)`.
+
+    Parameters
+    ----------
+    omega : float, optional
+        The relaxation factor, 0 < omega <= 1 (default is 0.5).
+
+    Attributes
+    ----------
+    _omega : float
+        The relaxation factor.
+    """
+    def __init__(self, omega:float=0.5) -> None:
+        if not 0 < omega <= 1:
+            raise ValueError(f'omega must be in (0, 1], got {omega}')
+        self._omega = omega
+
+
+    def update(self, x:np.ndarray, gx:np.ndarray) -> np.ndarray:
+        return x + self._omega * (gx - x)
+
+
+class Aitken(Picard):
+    """
+    Relaxation with a factor adapted by Aitken's delta-squared method.
+
+    Parameters
+    ----------
+    omega : float, optional
+        The relaxation factor of the first update (default is 0.5).
+    omega_min : float, optional
+        Lower bound of the adapted factor (default is 0.05).
+    omega_max : float, optional
+        Upper bound of the adapted factor (default is 1.5).
+
+    Attributes
+    ----------
+    _omega_init : float
+        The relaxation factor of the first update.
+    _omega : float
+        The current relaxation factor.
+    _residual : np.ndarray or None
+        The residual `g(x) - x` of the previous update.
+    """
+    def __init__(
+            self,
+            omega:float=0.5,
+            omega_min:float=0.05,
+            omega_max:float=1.5
+            ) -> None:
+        self._omega_init = omega
+        self._omega_min = omega_min
+        self._omega_max = omega_max
+        self.reset()
+
+
+    def reset(self) -> None:
+        self._omega = self._omega_init
+        self._residual = None
+
+
+    def update(self, x:np.ndarray, gx:np.ndarray) -> np.ndarray:
+        residual = gx - x
+        if self._residual is not None:
+            delta = residual - self._residual
+            denom = float(delta @ delta)
+            if denom > 0:
+                omega = -self._omega * float(self._residual @ delta) / denom
+                self._omega = float(np.clip(omega, self._omega_min, self._omega_max))
+        self._residual = residual
+        x_new = x + self._omega * residual
+        if np.any(x_new <= 0):
+            self.reset()
+            return gx
+        return x_new
+
+
+class Anderson(Picard):
+    """
+    Anderson mixing over the last `depth` iterates.
+
+    Parameters
+    ----------
+    depth : int, optional
+        The number of previous iterates taken into account (default is 5).
+    beta : float, optional
+        The mixing parameter, 1 gives the undamped method (default is 1).
+
+    Attributes
+    ----------
+    _depth : int
+        The number of previous iterates taken into account.
+    _beta : float
+        The mixing parameter.
+    _dx : list of np.ndarray
+        Differences of the last iterates.
+    _dr : list of np.ndarray
+        Differences of the last residuals.
+    """
+    def __init__(self, depth:int=5, beta:float=1.0) -> None:
+        if depth < 1:
+            raise ValueError(f'depth must be at least 1, got {depth}')
+        self._depth = depth
+        self._beta = beta
+        self.reset()
+
+
+    def reset(self) -> None:
+        self._x = None
+        self._residual = None
+        self._dx = []
+        self._dr = []
+
+
+    def update(self, x:np.ndarray, gx:np.ndarray) -> np.ndarray:
+        residual = gx - x
+        if self._x is not None:
+            self._dx.append(x - self._x)
+            self._dr.append(residual - self._residual)
+            if len(self._dx) > self._depth:
+                self._dx.pop(0)
+                self._dr.pop(0)
+        self._x = x
+        self._residual = residual
+
+        x_new = x + self._beta * residual
+        if self._dx:
+            dX = np.column_stack(self._dx)
+            dR = np.column_stack(self._dr)
+            gamma = np.linalg.lstsq(dR, residual, rcond=None)[0]
+            x_new = x_new - (dX + self._beta * dR) @ gamma
+
+        if not np.all(np.isfinite(x_new)) or np.any(x_new <= 0):
+            # the extrapolation left the admissible range, restart plainly
+            self.reset()
+            return gx
+        return x_new
+
+
+ACCELERATORS = {
+    'picard':Picard,
+    'relaxation':Relaxation,
+    'aitken':Aitken,
+    'anderson':Anderson,
+}
+
+
+def to_accelerator(acceleration:str|Picard) -> Picard:
+    """
+    Returns an accelerator instance for a name or passes an instance through.
+
+    Parameters
+    ----------
+    acceleration : str or Picard
+        One of 'picard', 'relaxation', 'aitken', 'anderson' or an instance
+        of one of the accelerator classes.
+
+    Returns
+    -------
+    Picard
+    """
+    if isinstance(acceleration, Picard):
+        return acceleration
+    try:
+        return ACCELERATORS[acceleration]()
+    except KeyError:
+        raise ValueError(
+            f"unknown acceleration '{acceleration}', "
+            f"choose from {list(ACCELERATORS)}"
+            ) from None
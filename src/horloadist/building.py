@@ -0,0 +1,223 @@
+import pandas as pd
+import numpy as np
+
+from . import kernel
+from .structure import Stucture
+
+
+class Building:
+    """
+    A class to represent a building as a stack of storeys.
+
+    Each storey is a `Stucture` with its own walls, stiffnesses and mass
+    centre. Storey forces act at the mass centre of their storey and are
+    accumulated from the top down: the walls of a storey carry the shear of
+    all storeys above and including it, together with the torsion this
+    shear causes about the storey's own stiffness centre. The distribution
+    of all storeys is one call of `kernel.distribute` on the wall arrays
+    padded to storeys x walls, the padding walls having zero stiffness.
+
+    Parameters
+    ----------
+    storeys : list of Stucture
+        The storeys, ordered from the bottom to the top.
+    storey_heights : array_like
+        The height of every storey, shape (storeys,).
+    x_storey_forces : array_like
+        The force in the x-direction applied at every storey's mass centre,
+        shape (storeys,).
+    y_storey_forces : array_like
+        The force in the y-direction applied at every storey's mass centre,
+        shape (storeys,).
+
+    Attributes
+    ----------
+    _storeys : list of Stucture
+        The storeys, ordered from the bottom to the top.
+    _z_levels : np.ndarray
+        The height of the top of every storey above the base.
+    _node_storey : np.ndarray
+        The storey index of every wall in the concatenated arrays.
+    _node_mask : np.ndarray
+        The positions of the walls in the padded (storeys, walls) arrays.
+    _shear_x : np.ndarray
+        The accumulated shear force in the x-direction of every storey.
+    _shear_y : np.ndarray
+        The accumulated shear force in the y-direction of every storey.
+    _overturning_x : np.ndarray
+        The overturning moment Mx at the bottom of every storey from the
+        forces in the y-direction (Mx = Vy * z, as in `NonLinSolve`).
+    _overturning_y : np.ndarray
+        The overturning moment My at the bottom of every storey from the
+        forces in the x-direction (My = Vx * z, as in `NonLinSolve`).
+    _torsion_Ts : np.ndarray
+        The torsion moment of every storey about its stiffness centre.
+    _node_final_Vx : np.ndarray
+        Final wall forces in the x-direction of all storeys.
+    _node_final_Vy : np.ndarray
+        Final wall forces in the y-direction of all storeys.
+    _table : pd.DataFrame
+        DataFrame with one row per wall and storey.
+    _storey_table : pd.DataFrame
+        DataFrame with one row per storey.
+    """
+    def __init__(
+            self,
+            storeys:list[Stucture],
+            storey_heights:np.ndarray|list[float],
+            x_storey_forces:np.ndarray|list[float],
+            y_storey_forces:np.ndarray|list[float]
+            ) -> None:
+        n_storeys = len(storeys)
+        for storey in storeys:
+            storey._warn_decoupled('Building')
+
+        self._storeys = storeys
+        self._storey_heights = self._per_storey(storey_heights, n_storeys)
+        self._x_forces = self._per_storey(x_storey_forces, n_storeys)
+        self._y_forces = self._per_storey(y_storey_forces, n_storeys)
+        self._z_levels = np.cumsum(self._storey_heights)
+
+        self._main()
+
+
+    @staticmethod
+    def _per_storey(values:np.ndarray|list[float], n_storeys:int) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+        if values.shape != (n_storeys,):
+            raise ValueError(
+                f'expected one value per storey ({n_storeys}), got {values.shape}'
+                )
+        return values
+
+
+    @staticmethod
+    def _from_top(values:np.ndarray) -> np.ndarray:
+        return np.cumsum(values[::-1])[::-1]
+
+
+    def _stack_storeys(self) -> None:
+        storeys = self._storeys
+        self._node_counts = np.array([len(s._linnodes) for s in storeys])
+        self._node_storey = np.repeat(np.arange(len(storeys)), self._node_counts)
+        self._node_mask = (
+            np.arange(self._node_counts.max(initial=0)) < self._node_counts[:, np.newaxis]
+            )
+        self._node_numbers = np.concatenate([s._node_numbers for s in storeys])
+        self._node_x = np.concatenate([s._glo_node_x for s in storeys])
+        self._node_y = np.concatenate([s._glo_node_y for s in storeys])
+        self._node_EIx = np.concatenate([s._node_EIx for s in storeys])
+        self._node_EIy = np.concatenate([s._node_EIy for s in storeys])
+        self._mass_centre_x = np.array([s._glo_mass_centre_x for s in storeys], dtype=float)
+        self._mass_centre_y = np.array([s._glo_mass_centre_y for s in storeys], dtype=float)
+
+
+    def _padded(self, values:np.ndarray) -> np.ndarray:
+        # (storeys, walls) layout for the kernel, padding walls are zero
+        padded = np.zeros(self._node_mask.shape)
+        padded[self._node_mask] = values
+        return padded
+
+
+    def _distribute(self) -> None:
+        storey = self._node_storey
+
+        # coordinates relative to each storey's own mass centre
+        x = self._padded(self._node_x - self._mass_centre_x[storey])
+        y = self._padded(self._node_y - self._mass_centre_y[storey])
+        EIx = self._padded(self._node_EIx)
+        EIy = self._padded(self._node_EIy)
+
+        sums = kernel.stiffness_sums(x, y, EIx, EIy)
+        xs, ys = kernel.stiffness_centre(sums)
+        self._stiff_centre_x = xs + self._mass_centre_x
+        self._stiff_centre_y = ys + self._mass_centre_y
+        self._global_EIw = kernel.warping_stiffness(sums)
+
+        # the forces above act at their own mass centres, their moment
+        # about this storey's mass centre is accumulated top down
+        Fx, Fy = self._x_forces, self._y_forces
+        Mz = (
+            self._from_top(self._mass_centre_x * Fy - self._mass_centre_y * Fx)
+            - self._mass_centre_x * self._shear_y
+            + self._mass_centre_y * self._shear_x
+            )
+        self._torsion_Ts = kernel.torsion(self._shear_x, self._shear_y, xs, ys) + Mz
+
+        Vx, Vy = kernel.distribute(
+            x, y, EIx, EIy, self._shear_x, self._shear_y, sums=sums, Mz=Mz
+            )
+        self._node_final_Vx = Vx[self._node_mask]
+        self._node_final_Vy = Vy[self._node_mask]
+
+
+    def _main(self) -> None:
+        self._stack_storeys()
+
+        self._shear_x = self._from_top(self._x_forces)
+        self._shear_y = self._from_top(self._y_forces)
+
+        # moment of the forces above about the bottom of every storey
+        z_bottom = self._z_levels - self._storey_heights
+        lever = self._z_levels[np.newaxis, :] - z_bottom[:, np.newaxis]
+        above = np.triu(np.ones((len(self._storeys),) * 2, dtype=bool))
+        lever = np.where(above, lever, 0.0)
+        self._overturning_x = lever @ self._y_forces
+        self._overturning_y = lever @ self._x_forces
+
+        self._distribute()
+
+
+    @property
+    def _storey_table(self) -> pd.DataFrame:
+
+        storey_table = {
+            'storey':np.arange(len(self._storeys)),
+            'z':self._z_levels,
+            'Fx':self._x_forces,
+            'Fy':self._y_forces,
+            'Vx storey':self._shear_x,
+            'Vy storey':self._shear_y,
+            'Mx storey':self._overturning_x,
+            'My storey':self._overturning_y,
+            'glo xs':self._stiff_centre_x,
+            'glo ys':self._stiff_centre_y,
+            'EIw':self._global_EIw,
+            'Ts':self._torsion_Ts,
+        }
+
+        return pd.DataFrame(storey_table)
+
+
+    @property
+    def _table(self) -> pd.DataFrame:
+
+        result_table = {
+            'storey':self._node_storey,
+            'node nr':self._node_numbers,
+            'glo x':self._node_x,
+            'glo y':self._node_y,
+            'EIx':self._node_EIx,
+            'EIy':self._node_EIy,
+            'Vx':self._node_final_Vx,
+            'Vy':self._node_final_Vy,
+        }
+
+        return pd.DataFrame(result_table)
+
+
+    def printTable(self) -> None:
+        """
+        Prints the storey forces and the wall forces of all storeys.
+
+        Returns
+        -------
+        None
+        """
+        print(
+            "\n"
+            f"storeys                 : {len(self._storeys)}\n"
+            f"height                  : {self._z_levels[-1]:0.4f}\n"
+            f"\n{self._storey_table}\n"
+            f"\n{self._table}\n"
+            )
@@ -0,0 +1,309 @@
+import pandas as pd
+import numpy as np
+
+from .structure import Stucture
+
+
+def _cantilever_stiffness(h:np.ndarray) -> np.ndarray:
+    # Euler-Bernoulli beam with EI = 1 on (u_bottom, phi_bottom, u_top, phi_top)
+    a, b, c, d = 12 / h**3, 6 / h**2, 4 / h, 2 / h
+    k = np.array([
+        [ a,  b, -a,  b],
+        [ b,  c, -b,  d],
+        [-a, -b,  a, -b],
+        [ b,  d, -b,  c],
+        ])
+    return np.moveaxis(k, -1, 0)
+
+
+class CoupledBuilding:
+    """
+    A class to represent a building solved as one coupled system.
+
+    Every storey is a rigid diaphragm with the displacements (ux, uy,
+    rotation) of its mass centre. The walls are Euler-Bernoulli cantilever
+    elements between two levels, bending in x and y with the 2x2 stiffness
+    `[[EIy, EIxy], [EIxy, EIx]]` of the node. A wall continues over the
+    height where the storey below has a node with the same number; there
+    the wall rotations at the level are shared. Walls are clamped at the
+    base and where they do not continue below. The global stiffness matrix
+    (3 DOF per storey plus 2 rotations per wall and level) is assembled as
+    a SciPy sparse matrix and factorized once with `splu` for all load
+    cases.
+
+    Unlike `Building`, the shear of a storey is not distributed by the
+    stiffnesses of that storey alone: walls interact over the height, e.g.
+    when stiffnesses change between storeys. For a single storey the
+    forces follow the stiffness proportions of `LinSolve`.
+
+    Parameters
+    ----------
+    storeys : list of Stucture
+        The storeys, ordered from the bottom to the top.
+    storey_heights : array_like
+        The height of every storey, shape (storeys,).
+    x_storey_forces : array_like
+        The force in the x-direction applied at every storey's mass centre,
+        shape (storeys,) or (cases, storeys).
+    y_storey_forces : array_like
+        The force in the y-direction applied at every storey's mass centre,
+        shape (storeys,) or (cases, storeys).
+    torsion_storey_Mz : array_like, optional
+        Additional torsion moments about every storey's mass centre, shape
+        (storeys,) or (cases, storeys) (default is 0).
+
+    Attributes
+    ----------
+    _storeys : list of Stucture
+        The storeys, ordered from the bottom to the top.
+    _z_levels : np.ndarray
+        The height of the top of every storey above the base.
+    _node_storey : np.ndarray
+        The storey index of every wall in the concatenated arrays.
+    _active_dofs : np.ndarray
+        The DOFs that are unknowns of the system, out of 3 per storey and 2
+        per wall.
+    _n_dofs : int
+        The number of unknowns of the system.
+    _stiffness_matrix : scipy.sparse.csc_matrix
+        The global stiffness matrix.
+    _lu : scipy.sparse.linalg.SuperLU
+        The factorization of `_stiffness_matrix`.
+    _displacements : np.ndarray
+        Displacements (ux, uy, rotation) of every storey's mass centre,
+        shape (cases, storeys, 3).
+    _node_final_Vx : np.ndarray
+        Shear forces in the x-direction of every wall, shape (cases, walls).
+    _node_final_Vy : np.ndarray
+        Shear forces in the y-direction of every wall, shape (cases, walls).
+    _node_Mx : np.ndarray
+        Bending moments at the bottom of every wall from the forces in the
+        y-direction (Mx = Vy * z for a cantilever, as in `NonLinSolve`).
+    _node_My : np.ndarray
+        Bending moments at the bottom of every wall from the forces in the
+        x-direction (My = Vx * z for a cantilever).
+    _table : pd.DataFrame
+        DataFrame with one row per wall, storey and load case.
+    """
+    def __init__(
+            self,
+            storeys:list[Stucture],
+            storey_heights:np.ndarray|list[float],
+            x_storey_forces:np.ndarray|list[float],
+            y_storey_forces:np.ndarray|list[float],
+            torsion_storey_Mz:np.ndarray|list[float]|float=0
+            ) -> None:
+        n_storeys = len(storeys)
+
+        self._storeys = storeys
+        self._storey_heights = np.asarray(storey_heights, dtype=float)
+        if self._storey_heights.shape != (n_storeys,):
+            raise ValueError(
+                f'expected one height per storey ({n_storeys}), '
+                f'got {self._storey_heights.shape}'
+                )
+        self._z_levels = np.cumsum(self._storey_heights)
+
+        forces = np.broadcast_arrays(
+            np.asarray(x_storey_forces, dtype=float),
+            np.asarray(y_storey_forces, dtype=float),
+            np.asarray(torsion_storey_Mz, dtype=float)
+            )
+        if forces[0].shape[-1:] != (n_storeys,) or forces[0].ndim > 2:
+            raise ValueError(
+                f'storey forces must have the shape (storeys,) or '
+                f'(cases, storeys), got {forces[0].shape}'
+                )
+        self._single_case = forces[0].ndim == 1
+        self._x_forces, self._y_forces, self._torsion_Mz = (
+            np.atleast_2d(force) for force in forces
+            )
+
+        self._main()
+
+
+    def _stack_storeys(self) -> None:
+        storeys = self._storeys
+        self._node_counts = np.array([len(s._linnodes) for s in storeys])
+        self._node_storey = np.repeat(np.arange(len(storeys)), self._node_counts)
+        self._node_numbers = np.concatenate([s._node_numbers for s in storeys])
+        self._node_x = np.concatenate([s._glo_node_x for s in storeys])
+        self._node_y = np.concatenate([s._glo_node_y for s in storeys])
+        self._node_EIx = np.concatenate([s._node_EIx for s in storeys])
+        self._node_EIy = np.concatenate([s._node_EIy for s in storeys])
+        self._node_EIxy = np.array(
+            [node._glob_EIxy for s in storeys for node in s._nodes], dtype=float
+            )
+        self._mass_centre_x = np.array([s._glo_mass_centre_x for s in storeys], dtype=float)
+        self._mass_centre_y = np.array([s._glo_mass_centre_y for s in storeys], dtype=float)
+
+
+    def _wall_below(self) -> np.ndarray:
+        # index of the same wall in the storey below, -1 where it starts
+        below = np.full(self._node_numbers.size, -1)
+        starts = np.concatenate(([0], np.cumsum(self._node_counts)))
+        for storey in range(1, len(self._storeys)):
+            index_below = {
+                nr:k for k, nr in enumerate(
+                    self._node_numbers[starts[storey-1]:starts[storey]].tolist(),
+                    start=starts[storey-1]
+                    )
+                }
+            for k in range(starts[storey], starts[storey+1]):
+                below[k] = index_below.get(self._node_numbers[k], -1)
+        return below
+
+
+    def _element_dofs(self) -> tuple[np.ndarray, np.ndarray]:
+        # per wall: 10 global DOFs (diaphragm and wall rotations at the
+        # bottom, then at the top; -1 is fixed) and the matrix B mapping
+        # them to the 8 element DOFs (ux, uy, phi_x, phi_y per end)
+        n_walls = self._node_numbers.size
+        n_storeys = len(self._storeys)
+        storey = self._node_storey
+        below = self._wall_below()
+
+        diaphragm = 3 * storey[:, np.newaxis] + np.arange(3)
+        rotation = 3 * n_storeys + 2 * np.arange(n_walls)[:, np.newaxis] + np.arange(2)
+        rotation_below = np.where(
+            below[:, np.newaxis] >= 0,
+            3 * n_storeys + 2 * below[:, np.newaxis] + np.arange(2),
+            -1
+            )
+        diaphragm_below = np.where(storey[:, np.newaxis] > 0, diaphragm - 3, -1)
+        dofs = np.hstack((diaphragm_below, rotation_below, diaphragm, rotation))
+
+        def translation(level_storey:np.ndarray) -> np.ndarray:
+            # T = [[1, 0, -(y - ym)], [0, 1, x - xm]] of the diaphragm
+            T = np.zeros((n_walls, 2, 3))
+            T[:, 0, 0] = T[:, 1, 1] = 1
+            T[:, 0, 2] = -(self._node_y - self._mass_centre_y[level_storey])
+            T[:, 1, 2] = self._node_x - self._mass_centre_x[level_storey]
+            return T
+
+        B = np.zeros((n_walls, 8, 10))
+        B[:, 0:2, 0:3] = translation(np.maximum(storey - 1, 0))
+        B[:, 2:4, 3:5] = np.eye(2)
+        B[:, 4:6, 5:8] = translation(storey)
+        B[:, 6:8, 8:10] = np.eye(2)
+        return dofs, B
+
+
+    def _element_stiffness(self) -> np.ndarray:
+        # kron of the unit beam (u_b, phi_b, u_t, phi_t) and the 2x2
+        # bending stiffness, ordered (ux, uy) per beam DOF
+        D = np.empty((self._node_numbers.size, 2, 2))
+        D[:, 0, 0] = self._node_EIy
+        D[:, 1, 1] = self._node_EIx
+        D[:, 0, 1] = D[:, 1, 0] = self._node_EIxy
+        beam = _cantilever_stiffness(self._storey_heights[self._node_storey])
+        return np.einsum('nab,nij->naibj', beam, D).reshape(-1, 8, 8)
+
+
+    def _assemble(self) -> None:
+        from scipy.sparse import coo_matrix
+
+        n_diaphragm = 3 * len(self._storeys)
+        n_total = n_diaphragm + 2 * self._node_numbers.size
+        self._dofs, self._B = self._element_dofs()
+        self._Ke = self._element_stiffness()
+
+        self._KeB = np.matmul(self._Ke, self._B)
+        K_e = np.matmul(self._B.transpose(0, 2, 1), self._KeB)
+        rows = np.broadcast_to(self._dofs[:, :, np.newaxis], K_e.shape)
+        cols = np.broadcast_to(self._dofs[:, np.newaxis, :], K_e.shape)
+        free = (rows >= 0) & (cols >= 0) & (K_e != 0)
+        K = coo_matrix(
+            (K_e[free], (rows[free], cols[free])),
+            shape=(n_total, n_total)
+            ).tocsc()
+
+        # wall rotations without bending stiffness, e.g. of walls acting in
+        # one direction only, are no unknowns
+        active = K.diagonal() != 0
+        active[:n_diaphragm] = True
+        self._active_dofs = np.flatnonzero(active)
+        self._n_dofs = self._active_dofs.size
+        self._stiffness_matrix = K[self._active_dofs][:, self._active_dofs]
+
+
+    def _factorize(self) -> None:
+        from scipy.sparse.linalg import splu
+
+        # the matrix is symmetric, a symmetric fill-reducing ordering keeps
+        # the factors small (COLAMD fills the diaphragm coupling densely)
+        self._lu = splu(
+            self._stiffness_matrix,
+            permc_spec='MMD_AT_PLUS_A',
+            diag_pivot_thresh=0.0,
+            options={'SymmetricMode':True}
+            )
+
+
+    def _solve(self) -> None:
+        n_cases, n_storeys = self._x_forces.shape
+
+        # the diaphragm DOFs come first and are always active
+        loads = np.zeros((self._n_dofs, n_cases))
+        loads[0:3*n_storeys:3] = self._x_forces.T
+        loads[1:3*n_storeys:3] = self._y_forces.T
+        loads[2:3*n_storeys:3] = self._torsion_Mz.T
+        u = np.zeros((3 * n_storeys + 2 * self._node_numbers.size, n_cases))
+        u[self._active_dofs] = self._lu.solve(loads)
+
+        self._displacements = u[:3*n_storeys].T.reshape(n_cases, n_storeys, 3)
+
+        # element end forces (Vx, Vy, Mx', My') at the bottom, then the top
+        u_e = np.where(
+            self._dofs[..., np.newaxis] >= 0, u[np.maximum(self._dofs, 0)], 0.0
+            )
+        f = np.moveaxis(np.matmul(self._KeB, u_e), -1, 0)
+        self._node_final_Vx = f[..., 4]
+        self._node_final_Vy = f[..., 5]
+        self._node_My = -f[..., 2]
+        self._node_Mx = -f[..., 3]
+
+
+    def _main(self) -> None:
+        self._stack_storeys()
+        self._assemble()
+        self._factorize()
+        self._solve()
+
+
+    @property
+    def _table(self) -> pd.DataFrame:
+        n_cases, n_walls = self._node_final_Vx.shape
+
+        result_table = {
+            'case':np.repeat(np.arange(n_cases), n_walls),
+            'storey':np.tile(self._node_storey, n_cases),
+            'node nr':np.tile(self._node_numbers, n_cases),
+            'Vx':self._node_final_Vx.ravel(),
+            'Vy':self._node_final_Vy.ravel(),
+            'Mx':self._node_Mx.ravel(),
+            'My':self._node_My.ravel(),
+        }
+
+        table = pd.DataFrame(result_table)
+        if self._single_case:
+            table = table.drop(columns='case')
+        return table
+
+
+    def printTable(self) -> None:
+        """
+        Prints the size of the system and the wall forces of all storeys.
+
+        Returns
+        -------
+        None
+        """
+        print(
+            "\n"
+            f"storeys                 : {len(self._storeys)}\n"
+            f"walls                   : {self._node_numbers.size}\n"
+            f"unknowns                : {self._n_dofs}\n"
+            f"load cases              : {self._x_forces.shape[0]}\n"
+            f"\n{self._table}\n"
+            )
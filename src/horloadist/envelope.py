@@ -0,0 +1,298 @@
+import pandas as pd
+import numpy as np
+
+from .structure import Stucture
+from .sweep import ParametricSweep
+
+
+class RunningEnvelope:
+    """
+    Running statistics of a stream of result rows.
+
+    Minimum, maximum and mean are exact. Percentiles are taken from a
+    uniform reservoir sample of at most `reservoir_size` rows (algorithm
+    R), so they are exact as long as fewer rows were added and a bounded
+    approximation afterwards. Memory does not grow with the number of rows.
+
+    Parameters
+    ----------
+    n_columns : int
+        The number of values per row, e.g. the number of nodes.
+    reservoir_size : int, optional
+        Maximum number of rows kept for the percentiles (default is 1000).
+    rng : np.random.Generator, optional
+        Random generator for the reservoir sampling.
+
+    Attributes
+    ----------
+    _count : int
+        The number of rows added so far.
+    _min : np.ndarray
+        Running minimum of every column.
+    _max : np.ndarray
+        Running maximum of every column.
+    _sum : np.ndarray
+        Running sum of every column.
+    _reservoir : np.ndarray
+        The sampled rows, shape (reservoir_size, n_columns).
+    """
+    def __init__(
+            self,
+            n_columns:int,
+            reservoir_size:int=1000,
+            rng:np.random.Generator|None=None
+            ) -> None:
+        self._count = 0
+        self._min = np.full(n_columns, np.inf)
+        self._max = np.full(n_columns, -np.inf)
+        self._sum = np.zeros(n_columns)
+        self._reservoir = np.empty((reservoir_size, n_columns))
+        self._rng = np.random.default_rng() if rng is None else rng
+
+
+    def add(self, rows:np.ndarray) -> None:
+        """
+        Adds a chunk of rows, shape (rows, n_columns).
+
+        Returns
+        -------
+        None
+        """
+        n_rows = rows.shape[0]
+        if n_rows == 0:
+            return
+        np.minimum(self._min, rows.min(axis=0), out=self._min)
+        np.maximum(self._max, rows.max(axis=0), out=self._max)
+        self._sum += rows.sum(axis=0)
+
+        size = self._reservoir.shape[0]
+        t = self._count + np.arange(n_rows)
+
+        fill = t < size
+        self._reservoir[t[fill]] = rows[fill]
+
+        # algorithm R: row t replaces a random slot with probability size/(t+1)
+        slots = self._rng.integers(0, t[~fill] + 1)
+        keep = slots < size
+        self._reservoir[slots[keep]] = rows[~fill][keep]
+
+        self._count += n_rows
+
+
+    def _check_count(self) -> None:
+        if self._count == 0:
+            raise ValueError('running envelope has no rows yet')
+
+
+    @property
+    def _mean(self) -> np.ndarray:
+        self._check_count()
+        return self._sum / self._count
+
+
+    def percentiles(self, q:float|list[float]) -> np.ndarray:
+        """
+        Returns percentiles of every column.
+
+        Parameters
+        ----------
+        q : float or list of float
+            Percentile(s) between 0 and 100.
+
+        Returns
+        -------
+        np.ndarray
+            Shape (len(q), n_columns), or (n_columns,) for a scalar `q`.
+        """
+        self._check_count()
+        n = min(self._count, self._reservoir.shape[0])
+        return np.percentile(self._reservoir[:n], q, axis=0)
+
+
+class MonteCarloEnvelope:
+    """
+    A class to compute envelopes of the nodal forces over random samples.
+
+    Samples shift the mass centre by an accidental eccentricity and/or
+    scatter the stiffness of every node with a lognormal factor. They are
+    drawn and evaluated in vectorized chunks with `ParametricSweep`, and
+    only running envelopes (min, max, mean and reservoir-based percentiles
+    of Vx and Vy per node) are kept, never the individual samples.
+
+    Parameters
+    ----------
+    structure : Stucture
+        The structure providing the nodes, their linear stiffnesses and the
+        mass centre.
+    x_mass_force : float, optional
+        The force applied in the x-direction at the mass centre (default is 1).
+    y_mass_force : float, optional
+        The force applied in the y-direction at the mass centre (default is 1).
+    n_samples : int, optional
+        The number of samples drawn on construction, at least 1 (default
+        is 10000).
+    ecc_x : float, optional
+        Amplitude of the accidental eccentricity of the mass centre in the
+        x-direction (default is 0).
+    ecc_y : float, optional
+        Amplitude of the accidental eccentricity of the mass centre in the
+        y-direction (default is 0).
+    ecc_distribution : str, optional
+        'uniform' draws the eccentricity from [-ecc, ecc], 'normal' uses
+        ecc as standard deviation, 'bounds' picks -ecc or +ecc (default is
+        'uniform').
+    EI_cov : float, optional
+        Coefficient of variation of the lognormal stiffness factor, drawn
+        independently per node and direction (default is 0).
+    percentiles : list of float, optional
+        Percentiles reported in `_table` (default is (5, 50, 95)).
+    chunk_size : int, optional
+        The number of samples evaluated at once (default is 1000).
+    reservoir_size : int, optional
+        The number of samples kept for the percentiles (default is 1000).
+    seed : int, optional
+        Seed of the random generator.
+
+    Attributes
+    ----------
+    _envelope_Vx : RunningEnvelope
+        Running envelope of the nodal forces in the x-direction.
+    _envelope_Vy : RunningEnvelope
+        Running envelope of the nodal forces in the y-direction.
+    _n_samples : int
+        The number of samples evaluated so far.
+    _table : pd.DataFrame
+        The envelopes with one row per node.
+    """
+    ECC_DISTRIBUTIONS = ('uniform', 'normal', 'bounds')
+
+    def __init__(
+            self,
+            structure:Stucture,
+            x_mass_force:float=1,
+            y_mass_force:float=1,
+            n_samples:int=10000,
+            ecc_x:float=0,
+            ecc_y:float=0,
+            ecc_distribution:str='uniform',
+            EI_cov:float=0,
+            percentiles:tuple[float, ...]|list[float]=(5, 50, 95),
+            chunk_size:int=1000,
+            reservoir_size:int=1000,
+            seed:int|None=None
+            ) -> None:
+        if ecc_distribution not in self.ECC_DISTRIBUTIONS:
+            raise ValueError(
+                f"unknown ecc_distribution '{ecc_distribution}', "
+                f"choose from {list(self.ECC_DISTRIBUTIONS)}"
+                )
+        if n_samples < 1:
+            raise ValueError(f'n_samples must be at least 1, got {n_samples}')
+        structure._warn_decoupled('MonteCarloEnvelope')
+
+        self._structure = structure
+        self._x_force = x_mass_force
+        self._y_force = y_mass_force
+        self._ecc = np.array([ecc_x, ecc_y], dtype=float)
+        self._ecc_distribution = ecc_distribution
+        self._EI_cov = EI_cov
+        self._percentiles = list(percentiles)
+        self._chunk_size = chunk_size
+        self._rng = np.random.default_rng(seed)
+
+        n_nodes = len(structure._linnodes)
+        self._envelope_Vx = RunningEnvelope(n_nodes, reservoir_size, self._rng)
+        self._envelope_Vy = RunningEnvelope(n_nodes, reservoir_size, self._rng)
+        self._n_samples = 0
+
+        self.addSamples(n_samples)
+
+
+    def _draw_eccentricities(self, n:int) -> np.ndarray:
+        if self._ecc_distribution == 'uniform':
+            unit = self._rng.uniform(-1, 1, size=(n, 2))
+        elif self._ecc_distribution == 'normal':
+            unit = self._rng.standard_normal(size=(n, 2))
+        else:
+            unit = self._rng.choice([-1.0, 1.0], size=(n, 2))
+        return unit * self._ecc
+
+
+    def _draw_stiffness_factors(self, n:int) -> np.ndarray:
+        n_nodes = len(self._structure._linnodes)
+        if self._EI_cov == 0:
+            return np.ones((2, 1, n_nodes))
+        # lognormal with mean 1 and the given coefficient of variation
+        sigma = np.sqrt(np.log1p(self._EI_cov**2))
+        return self._rng.lognormal(-sigma**2 / 2, sigma, size=(2, n, n_nodes))
+
+
+    def _evaluate_chunk(self, n:int) -> ParametricSweep:
+        structure = self._structure
+        centre = np.array([structure._glo_mass_centre_x, structure._glo_mass_centre_y])
+        factors = self._draw_stiffness_factors(n)
+        return ParametricSweep.from_structure(
+            structure,
+            glob_kx=structure._node_EIy * factors[0],
+            glob_ky=structure._node_EIx * factors[1],
+            glo_mass_centre=centre + self._draw_eccentricities(n),
+            x_mass_force=self._x_force,
+            y_mass_force=self._y_force,
+            )
+
+
+    def addSamples(self, n_samples:int) -> None:
+        """
+        Draws and evaluates further samples and updates the envelopes.
+
+        Parameters
+        ----------
+        n_samples : int
+            The number of samples to add.
+
+        Returns
+        -------
+        None
+        """
+        remaining = n_samples
+        while remaining > 0:
+            n = min(self._chunk_size, remaining)
+            sweep = self._evaluate_chunk(n)
+            self._envelope_Vx.add(sweep._node_final_Vx)
+            self._envelope_Vy.add(sweep._node_final_Vy)
+            self._n_samples += n
+            remaining -= n
+
+
+    @property
+    def _table(self) -> pd.DataFrame:
+
+        result_table = {'node nr':self._structure._node_numbers}
+        for name, envelope in (('Vx', self._envelope_Vx), ('Vy', self._envelope_Vy)):
+            result_table[f'{name} min'] = envelope._min
+            result_table[f'{name} max'] = envelope._max
+            result_table[f'{name} mean'] = envelope._mean
+            if self._percentiles:
+                percentiles = envelope.percentiles(self._percentiles)
+                for q, values in zip(self._percentiles, percentiles):
+                    result_table[f'{name} p{q:g}'] = values
+
+        return pd.DataFrame(result_table)
+
+
+    def printTable(self) -> None:
+        """
+        Prints the envelopes of the nodal forces.
+
+        Returns
+        -------
+        None
+        """
+        print(
+            "\n"
+            f"Fx, Fy                  : {self._x_force}, {self._y_force}\n"
+            f"ecc. x, y               : {self._ecc[0]}, {self._ecc[1]} ({self._ecc_distribution})\n"
+            f"EI cov                  : {self._EI_cov}\n"
+            f"samples                 : {self._n_samples}\n"
+            f"\n{self._table}\n"
+            )
@@ -0,0 +1,115 @@
+import pandas as pd
+from time import perf_counter
+from typing import Callable
+
+
+class PhaseTimer:
+    """
+    A collector for call counts and cumulative wall time per solver phase.
+
+    Pass an instance as `collector` to `NonLinSolve` (or `NonLinBatchSolve`)
+    to find out where the time goes. Solvers only time their phases when a
+    collector is given, so there is no timing overhead otherwise.
+
+    Attributes
+    ----------
+    _calls : dict
+        Number of calls per phase.
+    _seconds : dict
+        Cumulative wall time per phase in seconds.
+    """
+    def __init__(self) -> None:
+        self._calls = {}
+        self._seconds = {}
+
+
+    def record(self, phase:str, seconds:float, calls:int=1) -> None:
+        """
+        Adds the wall time of one or more calls of a phase.
+
+        Parameters
+        ----------
+        phase : str
+            Name of the phase.
+        seconds : float
+            Wall time in seconds.
+        calls : int, optional
+            Number of calls the time belongs to (default is 1).
+
+        Returns
+        -------
+        None
+        """
+        self._calls[phase] = self._calls.get(phase, 0) + calls
+        self._seconds[phase] = self._seconds.get(phase, 0.0) + seconds
+
+
+    def time(self, phase:str, func:Callable, *args, **kwargs):
+        """
+        Calls `func(*args, **kwargs)`, records its wall time under `phase`
+        and returns its result.
+        """
+        start = perf_counter()
+        result = func(*args, **kwargs)
+        self.record(phase, perf_counter() - start)
+        return result
+
+
+    def merge(self, other:'PhaseTimer') -> None:
+        """
+        Adds the records of another collector, e.g. from a worker process.
+
+        Returns
+        -------
+        None
+        """
+        for phase, calls in other._calls.items():
+            self.record(phase, other._seconds[phase], calls)
+
+
+    @property
+    def _table(self) -> pd.DataFrame:
+
+        table = pd.DataFrame({
+            'phase':list(self._calls),
+            'calls':list(self._calls.values()),
+            'total [s]':list(self._seconds.values()),
+        })
+        table['mean [ms]'] = table['total [s]'] / table['calls'] * 1e3
+        return table.sort_values('total [s]', ascending=False, ignore_index=True)
+
+
+    def printTable(self) -> None:
+        """
+        Prints call counts and wall times of all phases.
+
+        Returns
+        -------
+        None
+        """
+        print(f"\n{self._table}\n")
+
+
+def print_progress(solver, iteration:int, residuals:dict[str, float]) -> None:
+    """
+    Progress hook printing the iteration count, used by `NonLinSolve` for
+    `verbose=True`.
+
+    Parameters
+    ----------
+    solver : NonLinSolve
+        The running solver.
+    iteration : int
+        The iteration just finished, starting at 1.
+    residuals : dict
+        The residuals of this iteration.
+
+    Returns
+    -------
+    None
+    """
+    print(f"-> iteration {iteration}/{solver._iterations}", end='\r')
+    if solver._is_converged(residuals):
+        print(f"-> converged after {iteration} iterations")
+    elif iteration == solver._iterations:
+        print(f"-> stopped after {iteration} iterations")
@@ -0,0 +1,348 @@
+"""
+Array backend of the nonlinear iteration.
+
+The whole fixed-point loop of `NonLinSolve` (evaluate the stiffness curves,
+recompute the stiffness centre, distribute, take the new moments) runs on
+plain arrays: node coordinates relative to the mass centre, stiffnesses,
+and the knots of all stiffness curves packed into two flat arrays. With
+Numba installed the loop is compiled on first use, otherwise an equivalent
+vectorized NumPy loop is used.
+"""
+import numpy as np
+from importlib.util import find_spec
+
+from . import kernel
+
+
+HAS_NUMBA = find_spec('numba') is not None
+
+_numba_solver = None
+
+
+def pack_curves(curves:list) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Packs stiffness curves into flat knot arrays.
+
+    Curves shared by several nodes are stored once.
+
+    Parameters
+    ----------
+    curves : list of StiffnessCurve
+        One curve per nonlinear node.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        `knots_mom` and `knots_EI` with the knots of all unique curves one
+        after another, `offsets` where curve `c` occupies
+        `offsets[c]:offsets[c+1]`, and `curve_index` mapping every entry of
+        `curves` to its packed curve.
+    """
+    unique = {}
+    curve_index = np.array(
+        [unique.setdefault(id(curve), (len(unique), curve))[0] for curve in curves],
+        dtype=np.int64
+        )
+    packed = [curve for _, curve in unique.values()]
+
+    lengths = [curve._mom.size for curve in packed]
+    offsets = np.zeros(len(packed) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    if packed:
+        knots_mom = np.concatenate([curve._mom for curve in packed])
+        knots_EI = np.concatenate([curve._EI for curve in packed])
+    else:
+        knots_mom = knots_EI = np.empty(0)
+    return knots_mom, knots_EI, offsets, curve_index
+
+
+def evaluate_packed(
+        knots_mom:np.ndarray,
+        knots_EI:np.ndarray,
+        offsets:np.ndarray,
+        curve_index:np.ndarray,
+        mom:np.ndarray
+        ) -> np.ndarray:
+    """
+    Evaluates packed curves like `StiffnessCurve.__call__`.
+
+    Entry `j` of `mom` is evaluated on curve `curve_index[j]`, moments
+    outside the knots are extrapolated linearly from the end segments.
+
+    Returns
+    -------
+    np.ndarray
+        The stiffnesses, same shape as `mom`.
+    """
+    start = offsets[curve_index]
+    stop = offsets[curve_index + 1]
+
+    # vectorized binary search for the last knot i <= mom of the segment
+    # [i, i+1], clipped to the end segments for the extrapolation
+    lo, hi = start.copy(), stop - 2
+    for _ in range(int(np.diff(offsets).max(initial=2)).bit_length()):
+        active = lo < hi
+        mid = (lo + hi + 1) // 2
+        right = knots_mom[mid] <= mom
+        lo = np.where(active & right, mid, lo)
+        hi = np.where(active & ~right, mid - 1, hi)
+
+    mom_0, mom_1 = knots_mom[lo], knots_mom[lo + 1]
+    EI_0, EI_1 = knots_EI[lo], knots_EI[lo + 1]
+    dmom = mom_1 - mom_0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        EI = EI_0 + (EI_1 - EI_0) / dmom * (mom - mom_0)
+    return np.where(dmom == 0, np.where(mom < mom_1, EI_0, EI_1), EI)
+
+
+def _solve_arrays(
+        x, y, EIx, EIy,
+        index_x, curve_x, index_y, curve_y,
+        knots_mom, knots_EI, offsets,
+        Fx, Fy, z,
+        tol_force, tol_stiffness, tol_centre,
+        history, centre_history, residuals
+        ):
+    TINY = np.finfo(float).tiny
+    EIx, EIy = EIx.copy(), EIy.copy()
+
+    for row in range(residuals.shape[0] + 1):
+        if row > 0:
+            Vx, Vy = history[row-1, :, 2], history[row-1, :, 3]
+            EIx[index_x] = evaluate_packed(
+                knots_mom, knots_EI, offsets, curve_x, Vy[index_x] * z
+                )
+            EIy[index_y] = evaluate_packed(
+                knots_mom, knots_EI, offsets, curve_y, Vx[index_y] * z
+                )
+
+        sums = kernel.stiffness_sums(x, y, EIx, EIy)
+        Vx, Vy = kernel.distribute(x, y, EIx, EIy, Fx, Fy, sums)
+
+        # order as in NonLinSolve.HISTORY_QUANTITIES
+        record = history[row]
+        record[:, 0] = EIx
+        record[:, 1] = EIy
+        record[:, 2] = Vx
+        record[:, 3] = Vy
+        record[:, 4] = Vy * z
+        record[:, 5] = Vx * z
+        centre_history[row] = kernel.stiffness_centre(sums)
+
+        if row == 0:
+            continue
+
+        previous = history[row-1]
+        force_scale = max(np.abs(record[:, 2:4]).max(initial=0.0), TINY)
+        residuals[row-1, 0] = (
+            np.abs(record[:, 2:4] - previous[:, 2:4]).max(initial=0.0) / force_scale
+            )
+        residuals[row-1, 1] = (
+            np.abs(record[:, 0:2] - previous[:, 0:2])
+            / np.maximum(np.abs(record[:, 0:2]), TINY)
+            ).max(initial=0.0)
+        residuals[row-1, 2] = np.abs(centre_history[row] - centre_history[row-1]).max()
+
+        if (
+            residuals[row-1, 0] <= tol_force
+            and residuals[row-1, 1] <= tol_stiffness
+            and residuals[row-1, 2] <= tol_centre
+            ):
+            return row, True
+
+    return residuals.shape[0], False
+
+
+def _solve_loops(
+        x, y, EIx, EIy,
+        index_x, curve_x, index_y, curve_y,
+        knots_mom, knots_EI, offsets,
+        Fx, Fy, z,
+        tol_force, tol_stiffness, tol_centre,
+        history, centre_history, residuals
+        ):
+    # scalar version of _solve_arrays, written for compilation with Numba
+    TINY = np.finfo(np.float64).tiny
+    n_nodes = x.size
+    n_iterations = residuals.shape[0]
+    EIx, EIy = EIx.copy(), EIy.copy()
+
+    for row in range(n_iterations + 1):
+        if row > 0:
+            for nonlinear in range(2):
+                index = index_x if nonlinear == 0 else index_y
+                curve = curve_x if nonlinear == 0 else curve_y
+                for k in range(index.size):
+                    i = index[k]
+                    if nonlinear == 0:
+                        mom = history[row-1, i, 3] * z
+                    else:
+                        mom = history[row-1, i, 2] * z
+                    start, stop = offsets[curve[k]], offsets[curve[k] + 1]
+                    lo, hi = start, stop - 2
+                    while lo < hi:
+                        mid = (lo + hi + 1) // 2
+                        if knots_mom[mid] <= mom:
+                            lo = mid
+                        else:
+                            hi = mid - 1
+                    dmom = knots_mom[lo + 1] - knots_mom[lo]
+                    if dmom == 0:
+                        EI = knots_EI[lo] if mom < knots_mom[lo + 1] else knots_EI[lo + 1]
+                    else:
+                        EI = (
+                            knots_EI[lo]
+                            + (knots_EI[lo + 1] - knots_EI[lo]) / dmom
+                            * (mom - knots_mom[lo])
+                            )
+                    if nonlinear == 0:
+                        EIx[i] = EI
+                    else:
+                        EIy[i] = EI
+
+        S_EIx = S_EIy = S_EIx_x = S_EIy_y = S_EIx_xx = S_EIy_yy = 0.0
+        for i in range(n_nodes):
+            S_EIx += EIx[i]
+            S_EIy += EIy[i]
+            S_EIx_x += EIx[i] * x[i]
+            S_EIy_y += EIy[i] * y[i]
+            S_EIx_xx += EIx[i] * x[i] * x[i]
+            S_EIy_yy += EIy[i] * y[i] * y[i]
+        xs = S_EIx_x / S_EIx
+        ys = S_EIy_y / S_EIy
+        EIw = S_EIy_yy - S_EIy_y**2 / S_EIy + S_EIx_xx - S_EIx_x**2 / S_EIx
+        Ts_EIw = (Fx * ys - Fy * xs) / EIw
+        centre_history[row, 0] = xs
+        centre_history[row, 1] = ys
+
+        force_scale = 0.0
+        force_change = 0.0
+        stiffness_change = 0.0
+        for i in range(n_nodes):
+            Vx = EIy[i] * (Fx / S_EIy - (y[i] - ys) * Ts_EIw)
+            Vy = EIx[i] * (Fy / S_EIx + (x[i] - xs) * Ts_EIw)
+            history[row, i, 0] = EIx[i]
+            history[row, i, 1] = EIy[i]
+            history[row, i, 2] = Vx
+            history[row, i, 3] = Vy
+            history[row, i, 4] = Vy * z
+            history[row, i, 5] = Vx * z
+            if row > 0:
+                for q in range(2):
+                    V = history[row, i, 2 + q]
+                    force_scale = max(force_scale, abs(V))
+                    force_change = max(force_change, abs(V - history[row-1, i, 2 + q]))
+                    EI = history[row, i, q]
+                    stiffness_change = max(
+                        stiffness_change,
+                        abs(EI - history[row-1, i, q]) / max(abs(EI), TINY)
+                        )
+
+        if row == 0:
+            continue
+
+        residuals[row-1, 0] = force_change / max(force_scale, TINY)
+        residuals[row-1, 1] = stiffness_change
+        residuals[row-1, 2] = max(
+            abs(centre_history[row, 0] - centre_history[row-1, 0]),
+            abs(centre_history[row, 1] - centre_history[row-1, 1])
+            )
+
+        if (
+            residuals[row-1, 0] <= tol_force
+            and residuals[row-1, 1] <= tol_stiffness
+            and residuals[row-1, 2] <= tol_centre
+            ):
+            return row, True
+
+    return n_iterations, False
+
+
+def solve_packed(
+        x:np.ndarray,
+        y:np.ndarray,
+        EIx:np.ndarray,
+        EIy:np.ndarray,
+        index_x:np.ndarray,
+        curve_x:np.ndarray,
+        index_y:np.ndarray,
+        curve_y:np.ndarray,
+        knots_mom:np.ndarray,
+        knots_EI:np.ndarray,
+        offsets:np.ndarray,
+        Fx:float,
+        Fy:float,
+        z:float,
+        iterations:int,
+        tol_force:float,
+        tol_stiffness:float,
+        tol_centre:float,
+        use_numba:bool=True
+        ) -> tuple[np.ndarray, np.ndarray, np.ndarray, int, bool]:
+    """
+    Runs the nonlinear fixed-point iteration of `NonLinSolve` on arrays.
+
+    Parameters
+    ----------
+    x, y : np.ndarray
+        Node coordinates relative to the mass centre.
+    EIx, EIy : np.ndarray
+        Stiffnesses of the linear start state.
+    index_x, index_y : np.ndarray
+        Nodes whose EIx (from Mx = Vy*z) or EIy (from My = Vx*z) follow a
+        stiffness curve.
+    curve_x, curve_y : np.ndarray
+        Packed curve of every entry of `index_x` and `index_y`.
+    knots_mom, knots_EI, offsets : np.ndarray
+        The packed curves, see `pack_curves`.
+    Fx, Fy : float
+        Forces at the mass centre.
+    z : float
+        Height for the moments.
+    iterations : int
+        Maximum number of iterations.
+    tol_force, tol_stiffness, tol_centre : float
+        Tolerances as in `NonLinSolve`.
+    use_numba : bool, optional
+        Compile the loop with Numba if it is installed (default is True).
+
+    Returns
+    -------
+    tuple
+        `history` of shape (iterations + 1, nodes, 6) ordered as
+        `NonLinSolve.HISTORY_QUANTITIES`, `centre_history` of shape
+        (iterations + 1, 2), `residuals` of shape (iterations, 3), the
+        number of iterations run and whether the tolerances were met.
+    """
+    global _numba_solver
+
+    args = [
+        np.ascontiguousarray(x, dtype=float),
+        np.ascontiguousarray(y, dtype=float),
+        np.ascontiguousarray(EIx, dtype=float),
+        np.ascontiguousarray(EIy, dtype=float),
+        np.ascontiguousarray(index_x, dtype=np.int64),
+        np.ascontiguousarray(curve_x, dtype=np.int64),
+        np.ascontiguousarray(index_y, dtype=np.int64),
+        np.ascontiguousarray(curve_y, dtype=np.int64),
+        np.ascontiguousarray(knots_mom, dtype=float),
+        np.ascontiguousarray(knots_EI, dtype=float),
+        np.ascontiguousarray(offsets, dtype=np.int64),
+        float(Fx), float(Fy), float(z),
+        float(tol_force), float(tol_stiffness), float(tol_centre),
+        ]
+    n_rows = iterations + 1
+    history = np.empty((n_rows, args[0].size, 6))
+    centre_history = np.empty((n_rows, 2))
+    residuals = np.empty((iterations, 3))
+
+    if use_numba and HAS_NUMBA:
+        if _numba_solver is None:
+            import numba
+            _numba_solver = numba.njit(cache=True)(_solve_loops)
+        solver = _numba_solver
+    else:
+        solver = _solve_arrays
+
+    iterations_done, converged = solver(*args, history, centre_history, residuals)
+    return history, centre_history, residuals, int(iterations_done), bool(converged)
@@ -0,0 +1,139 @@
+"""
+Pure-array kernel of the stiffness-centre distribution.
+
+All functions work on plain NumPy arrays with the nodes along the last
+axis. Leading axes are broadcast, so a batch of plan variants or load cases
+is a single call. The coordinates are expected relative to a common origin,
+usually the mass centre; the stiffness centre is returned in the same
+system.
+
+The stiffness names follow `Stucture`: `EIx` carries the forces in
+y-direction and locates the stiffness centre in x, `EIy` carries the
+forces in x-direction and locates it in y.
+"""
+import numpy as np
+
+
+SUMS = ('EIx', 'EIy', 'EIx*x', 'EIy*y', 'EIx*x^2', 'EIy*y^2')
+
+
+def stiffness_moments(
+        x:np.ndarray,
+        y:np.ndarray,
+        EIx:np.ndarray,
+        EIy:np.ndarray
+        ) -> np.ndarray:
+    """
+    Per-node summands of the stiffness sums.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (6, ..., nodes) in the order of `SUMS`.
+    """
+    EIx_x, EIy_y = EIx * x, EIy * y
+    shape = np.broadcast_shapes(np.shape(EIx_x), np.shape(EIy_y))
+    moments = np.empty((6,) + shape)
+    moments[0] = EIx
+    moments[1] = EIy
+    moments[2] = EIx_x
+    moments[3] = EIy_y
+    moments[4] = EIx_x * x
+    moments[5] = EIy_y * y
+    return moments
+
+
+def stiffness_sums(
+        x:np.ndarray,
+        y:np.ndarray,
+        EIx:np.ndarray,
+        EIy:np.ndarray
+        ) -> np.ndarray:
+    """
+    Sums over all nodes from which the totals, the stiffness centre and the
+    warping stiffness follow.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (6, ...) in the order of `SUMS`.
+    """
+    return stiffness_moments(x, y, EIx, EIy).sum(axis=-1)
+
+
+def stiffness_centre(sums:np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Stiffness centre (xs, ys) from `stiffness_sums`.
+    """
+    return sums[2] / sums[0], sums[3] / sums[1]
+
+
+def warping_stiffness(sums:np.ndarray) -> np.ndarray:
+    """
+    Warping stiffness about the stiffness centre from `stiffness_sums`,
+    `sum(EIy*(y - ys)**2 + EIx*(x - xs)**2)`.
+    """
+    S_EIx, S_EIy, S_EIx_x, S_EIy_y, S_EIx_xx, S_EIy_yy = sums
+    return S_EIy_yy - S_EIy_y**2 / S_EIy + S_EIx_xx - S_EIx_x**2 / S_EIx
+
+
+def torsion(
+        Fx:np.ndarray|float,
+        Fy:np.ndarray|float,
+        xs:np.ndarray|float,
+        ys:np.ndarray|float
+        ) -> np.ndarray|float:
+    """
+    Torsion moment about the stiffness centre of forces acting at the
+    origin, `Ts = Fx*ys - Fy*xs`.
+    """
+    return Fx * ys - Fy * xs
+
+
+def distribute(
+        x:np.ndarray,
+        y:np.ndarray,
+        EIx:np.ndarray,
+        EIy:np.ndarray,
+        Fx:np.ndarray|float,
+        Fy:np.ndarray|float,
+        sums:np.ndarray|None=None,
+        Mz:np.ndarray|float=0
+        ) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Distributes forces acting at the origin to the nodes.
+
+    Parameters
+    ----------
+    x, y : np.ndarray
+        Node coordinates relative to the origin, shape (..., nodes).
+    EIx, EIy : np.ndarray
+        Node stiffnesses, shape (..., nodes).
+    Fx, Fy : np.ndarray or float
+        Forces at the origin, broadcast against the leading axes, e.g.
+        shape (cases,) for one plan and many load cases.
+    sums : np.ndarray, optional
+        Precomputed `stiffness_sums` of the nodes.
+    Mz : np.ndarray or float, optional
+        Additional torsion moment about the origin, broadcast as `Fx`
+        (default is 0).
+
+    Returns
+    -------
+    tuple of np.ndarray
+        The nodal forces (Vx, Vy), shape (..., nodes).
+    """
+    if sums is None:
+        sums = stiffness_sums(x, y, EIx, EIy)
+    # trailing node axis for broadcasting against the nodes
+    sums = np.asarray(sums)[..., np.newaxis]
+    Fx = np.asarray(Fx)[..., np.newaxis]
+    Fy = np.asarray(Fy)[..., np.newaxis]
+    Mz = np.asarray(Mz)[..., np.newaxis]
+
+    xs, ys = stiffness_centre(sums)
+    Ts_EIw = (torsion(Fx, Fy, xs, ys) + Mz) / warping_stiffness(sums)
+
+    Vx = EIy * (Fx / sums[1] - (y - ys) * Ts_EIw)
+    Vy = EIx * (Fy / sums[0] + (x - xs) * Ts_EIw)
+    return Vx, Vy
@@ -0,0 +1,188 @@
+import pandas as pd
+import numpy as np
+import os
+import hashlib
+
+from .stiffnesses import StiffnessCurve
+
+
+def _read_curve_csv(csv_path:str, momColName:str, EIColName:str) -> StiffnessCurve:
+    df = pd.read_csv(
+        csv_path,
+        usecols=[momColName, EIColName],
+        dtype={momColName:float, EIColName:float},
+        engine='c'
+        )
+    return StiffnessCurve.from_frame(df, momColName, EIColName)
+
+
+def _file_digest(path:str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class StiffnessLibrary:
+    """
+    A class to load moment-stiffness curves from csv files once.
+
+    Curves are deduplicated by resolved file path and column names: loading
+    the same file twice returns the same `StiffnessCurve` object, so nodes
+    sharing a wall type share one curve. Only the two needed columns are
+    parsed.
+
+    With a `cache_dir`, parsed curves are also stored as compressed `.npz`
+    files. A cache entry is used as long as the csv file has the same
+    modification time and size; if those changed but the sha256 of the
+    content did not (e.g. after a fresh checkout), the entry is reused
+    without parsing as well.
+
+    Parameters
+    ----------
+    cache_dir : str, optional
+        Directory for the binary cache. None disables the disk cache
+        (default is None).
+
+    Attributes
+    ----------
+    _curves : dict
+        Loaded curves by (resolved path, moment column, stiffness column).
+    _cache_dir : str or None
+        Directory of the binary cache.
+    _hits : int
+        Number of curves read from the binary cache.
+    _misses : int
+        Number of curves parsed from csv.
+    """
+    def __init__(self, cache_dir:str|None=None) -> None:
+        self._curves = {}
+        self._cache_dir = None if cache_dir is None else os.fspath(cache_dir)
+        self._hits = 0
+        self._misses = 0
+        if self._cache_dir is not None:
+            os.makedirs(self._cache_dir, exist_ok=True)
+
+
+    def __len__(self) -> int:
+        return len(self._curves)
+
+
+    def _cache_path(self, key:tuple[str, str, str]) -> str:
+        name = hashlib.sha1('|'.join(key).encode()).hexdigest()
+        return os.path.join(self._cache_dir, f'{name}.npz')
+
+
+    def _load_cached(
+            self,
+            key:tuple[str, str, str],
+            stat:os.stat_result
+            ) -> StiffnessCurve|None:
+        cache_path = self._cache_path(key)
+        if not os.path.exists(cache_path):
+            return None
+
+        with np.load(cache_path) as entry:
+            unchanged = (
+                int(entry['mtime_ns']) == stat.st_mtime_ns
+                and int(entry['size']) == stat.st_size
+                )
+            if not unchanged and str(entry['sha256']) != _file_digest(key[0]):
+                return None
+            mom, EI = entry['mom'], entry['EI']
+
+        if not unchanged:
+            self._store_cached(key, stat, mom, EI)
+        return StiffnessCurve(mom, EI)
+
+
+    def _store_cached(
+            self,
+            key:tuple[str, str, str],
+            stat:os.stat_result,
+            mom:np.ndarray,
+            EI:np.ndarray
+            ) -> None:
+        cache_path = self._cache_path(key)
+        tmp_path = f'{cache_path}.{os.getpid()}.tmp.npz'
+        np.savez_compressed(
+            tmp_path,
+            mom=mom,
+            EI=EI,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            sha256=_file_digest(key[0]),
+            )
+        # atomic, so parallel runs never see a half written entry
+        os.replace(tmp_path, cache_path)
+
+
+    def load(
+            self,
+            csv_path:str,
+            momColName:str='mom',
+            EIColName:str='EI'
+            ) -> StiffnessCurve:
+        """
+        Returns the curve of a csv file, loading it only once.
+
+        Parameters
+        ----------
+        csv_path : str
+            Path of the csv file.
+        momColName : str, optional
+            Name of the moment column (default is 'mom').
+        EIColName : str, optional
+            Name of the stiffness column (default is 'EI').
+
+        Returns
+        -------
+        StiffnessCurve
+        """
+        key = (os.path.realpath(csv_path), momColName, EIColName)
+        try:
+            return self._curves[key]
+        except KeyError:
+            pass
+
+        curve = None
+        if self._cache_dir is not None:
+            stat = os.stat(key[0])
+            curve = self._load_cached(key, stat)
+
+        if curve is None:
+            curve = _read_curve_csv(*key)
+            self._misses += 1
+            if self._cache_dir is not None:
+                self._store_cached(key, stat, curve._mom, curve._EI)
+        else:
+            self._hits += 1
+
+        self._curves[key] = curve
+        return curve
+
+
+    def loadMany(
+            self,
+            csv_paths:list[str],
+            momColName:str='mom',
+            EIColName:str='EI'
+            ) -> list[StiffnessCurve]:
+        """
+        Returns the curves of many csv files, see `load`.
+
+        Parameters
+        ----------
+        csv_paths : list of str
+            Paths of the csv files, duplicates are loaded once.
+        momColName : str, optional
+            Name of the moment column (default is 'mom').
+        EIColName : str, optional
+            Name of the stiffness column (default is 'EI').
+
+        Returns
+        -------
+        list of StiffnessCurve
+        """
+        return [self.load(path, momColName, EIColName) for path in csv_paths]
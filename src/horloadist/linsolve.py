@@ -1,7 +1,8 @@
 import pandas as pd
+import numpy as np
 
-from .node import SupportNode
 from .structure import Stucture
+from . import kernel
 
 
 class LinSolve:
@@ -32,22 +33,23 @@ class LinSolve:
         Torsion moment caused by force in the y-direction.
     _torsion_Ts : float
         Total torsion moment caused by both x and y forces.
-    _node_Vx_from_EIx : pd.Series
+    _node_Vx_from_EIx : np.ndarray
         Nodal force in the x-direction based on flexural rigidity (EIx).
-    _node_Vy_from_EIy : pd.Series
+    _node_Vy_from_EIy : np.ndarray
         Nodal force in the y-direction based on flexural rigidity (EIy).
-    _node_Vx_from_EIwx : pd.Series
+    _node_Vx_from_EIwx : np.ndarray
         Nodal force in the x-direction caused by torsion moment (EIwx).
-    _node_Vy_from_EIwy : pd.Series
+    _node_Vy_from_EIwy : np.ndarray
         Nodal force in the y-direction caused by torsion moment (EIwy).
-    _node_final_Vx : pd.Series
+    _node_final_Vx : np.ndarray
         Final nodal force in the x-direction after considering both flexural and torsional contributions.
-    _node_final_Vy : pd.Series
+    _node_final_Vy : np.ndarray
         Final nodal force in the y-direction after considering both flexural and torsional contributions.
     _table : pd.DataFrame
         DataFrame containing calculated nodal forces in both directions and torsional effects.
     """  
     def __init__(self, structure:Stucture, x_mass_force:float=1, y_mass_force:float=1):
+        structure._warn_decoupled('LinSolve')
         self._structure = structure
         self._x_force = x_mass_force
         self._y_force = y_mass_force
@@ -73,28 +75,31 @@ class LinSolve:
         return self._torsion_Ts_from_x + self._torsion_Ts_from_y
 
     @property
-    def _node_Vx_from_EIx(self) -> pd.Series:
+    def _node_Vx_from_EIx(self) -> np.ndarray:
         return self._structure._node_EIx_proportion * self._x_force
     
     @property
-    def _node_Vy_from_EIy(self) -> pd.Series:
+    def _node_Vy_from_EIy(self) -> np.ndarray:
         return self._structure._node_EIy_proportion * self._y_force
     
     @property
-    def _node_Ts_from_EIwx(self) -> pd.Series:
+    def _node_Ts_from_EIwx(self) -> np.ndarray:
         return - self._structure._node_EIwx_proportion * self._torsion_Ts
     
     @property
-    def _node_Ts_from_EIwy(self) -> pd.Series:
+    def _node_Ts_from_EIwy(self) -> np.ndarray:
         return   self._structure._node_EIwy_proportion * self._torsion_Ts
     
+    def _distribution(self) -> tuple[np.ndarray, np.ndarray]:
+        return self._structure._distribute(self._x_force, self._y_force)
+
     @property
-    def _node_final_Vx(self) -> pd.Series:
-        return self._node_Vx_from_EIx + self._node_Ts_from_EIwx
+    def _node_final_Vx(self) -> np.ndarray:
+        return self._distribution()[0]
     
     @property
-    def _node_final_Vy(self) -> pd.Series:
-        return self._node_Vy_from_EIy + self._node_Ts_from_EIwy
+    def _node_final_Vy(self) -> np.ndarray:
+        return self._distribution()[1]
     
 
     @property
@@ -140,21 +145,101 @@ class LinSolve:
         """
         Updates the reaction forces (Rx, Ry) for each node in the structure.
 
-        This method calculates the x and y reaction forces for each node based on the 
-        computed nodal forces and assigns them to the node's attributes.
+        This method calculates the x and y reaction forces for all nodes at once
+        and assigns them positionally to the node's attributes.
 
         Returns
         -------
         None
         """
-        def extracVxByNode(node:SupportNode) -> float:
-            rx = self._table['Vx'].loc[self._table['node nr'] == node._nr]
-            return float(rx.iloc[0])
-        
-        def extracVyByNode(node:SupportNode) -> float:
-            ry = self._table['Vy'].loc[self._table['node nr'] == node._nr]
-            return float(ry.iloc[0])
+        Vx, Vy = self._distribution()
+        self._structure._set_reactions(-Vx, -Vy)
+
+
+class BatchLinSolve:
+    """
+    A class to represent the linear solver for many load cases at once.
+
+    The distribution is linear in Fx and Fy, so the stiffness proportions
+    of the structure are computed once and every load case is a row of an
+    outer product.
+
+    Parameters
+    ----------
+    structure : Structure
+        The structure object that contains the necessary geometric and stiffness information.
+    mass_forces : array_like
+        The forces (Fx, Fy) applied at the mass centre, one row per load
+        case, shape (cases, 2).
+
+    Attributes
+    ----------
+    _structure : Structure
+        The structure object containing information about the geometry and stiffness center.
+    _x_forces : np.ndarray
+        Forces acting along the x-axis, shape (cases,).
+    _y_forces : np.ndarray
+        Forces acting along the y-axis, shape (cases,).
+    _torsion_Ts : np.ndarray
+        Total torsion moment of every load case, shape (cases,).
+    _node_final_Vx : np.ndarray
+        Final nodal forces in the x-direction, shape (cases, nodes).
+    _node_final_Vy : np.ndarray
+        Final nodal forces in the y-direction, shape (cases, nodes).
+    _table : pd.DataFrame
+        Long-format DataFrame with one row per load case and node.
+    """
+    def __init__(
+            self,
+            structure:Stucture,
+            mass_forces:np.ndarray|list[tuple[float, float]]
+            ):
+        forces = np.atleast_2d(np.asarray(mass_forces, dtype=float))
+        if forces.ndim != 2 or forces.shape[1] != 2:
+            raise ValueError(
+                f'mass_forces must have the shape (cases, 2), got {forces.shape}'
+                )
+        structure._warn_decoupled('BatchLinSolve')
+
+        self._structure = structure
+        self._x_forces = forces[:, 0]
+        self._y_forces = forces[:, 1]
+
+        self._main()
 
-        for node in self._structure._linnodes:
-            node._Rx = -extracVxByNode(node)
-            node._Ry = -extracVyByNode(node)
\ No newline at end of file
+
+    def _main(self) -> None:
+        structure = self._structure
+        Fx, Fy = self._x_forces, self._y_forces
+
+        self._torsion_Ts = kernel.torsion(
+            Fx, Fy, structure._loc_stiff_centre_x, structure._loc_stiff_centre_y
+            )
+        self._node_final_Vx, self._node_final_Vy = structure._distribute(Fx, Fy)
+
+
+    @property
+    def _table(self) -> pd.DataFrame:
+        n_cases, n_nodes = self._node_final_Vx.shape
+
+        result_table = {
+            'case':np.repeat(np.arange(n_cases), n_nodes),
+            'node nr':np.tile(self._structure._node_numbers, n_cases),
+            'Fx':np.repeat(self._x_forces, n_nodes),
+            'Fy':np.repeat(self._y_forces, n_nodes),
+            'Vx':self._node_final_Vx.ravel(),
+            'Vy':self._node_final_Vy.ravel(),
+        }
+
+        return pd.DataFrame(result_table)
+
+
+    def printTable(self) -> None:
+        """
+        Prints the nodal forces of all load cases.
+
+        Returns
+        -------
+        None
+        """
+        print(f"\nload cases              : {self._x_forces.size}\n\n{self._table}\n")
@@ -0,0 +1,302 @@
+import pandas as pd
+import numpy as np
+
+from .polygon import Polygon, pack_polygons, polygon_properties
+
+
+class MassModel:
+    """
+    A class to represent the mass of a storey made of area, line and point
+    masses, each assigned to a load group.
+
+    The mass centre and the polar mass moment are evaluated for any number
+    of load combinations at once, a combination being a factor per load
+    group. The mass centre can be passed to `Stucture` as
+    `glo_mass_centre`, either as array or as the model itself.
+
+    Attributes
+    ----------
+    _groups : list of str
+        The load groups in the order of their first use.
+    _areas : list of tuple
+        The slab areas as (polygon, group, load).
+    _items : list of tuple
+        The line and point masses as (kind, group, mass, x, y, j), where
+        `j` is the polar moment of the item about its own centre per unit
+        mass.
+    _centre : np.ndarray
+        The mass centre with all factors 1.
+    _polar_moment : float
+        The polar mass moment about `_centre` with all factors 1.
+    _table : pd.DataFrame
+        DataFrame containing the items, their mass and centre.
+    """
+    def __init__(self) -> None:
+        self._groups = []
+        self._items = []
+        self._areas = []
+        self._packed = None
+
+
+    def _add(self, kind:str, group:str, mass:float, x:float, y:float, j:float) -> None:
+        if group not in self._groups:
+            self._groups.append(group)
+        self._items.append((kind, group, float(mass), float(x), float(y), float(j)))
+        self._packed = None
+
+
+    def addArea(self, polygon:Polygon, load:float, group:str='G') -> None:
+        """
+        Adds a slab area with a uniform surface load.
+
+        Parameters
+        ----------
+        polygon : Polygon
+            The slab outline, holes are not loaded.
+        load : float
+            Mass (or load) per unit area.
+        group : str, optional
+            The load group (default is 'G').
+
+        Returns
+        -------
+        None
+        """
+        if group not in self._groups:
+            self._groups.append(group)
+        self._areas.append((polygon, group, float(load)))
+        self._packed = None
+
+
+    def addLine(
+            self,
+            glob_xy:list[list[float|int]],
+            load:float,
+            group:str='G'
+            ) -> None:
+        """
+        Adds a line mass such as a facade along an open polyline.
+
+        Parameters
+        ----------
+        glob_xy : list of tuple of float
+            Vertices of the polyline, close it by repeating the first vertex.
+        load : float
+            Mass (or load) per unit length.
+        group : str, optional
+            The load group (default is 'G').
+
+        Returns
+        -------
+        None
+        """
+        xy = np.asarray(glob_xy, dtype=float).reshape(-1, 2)
+        start, end = xy[:-1], xy[1:]
+        lengths = np.hypot(*(end - start).T)
+        midpoints = (start + end) / 2
+
+        length = lengths.sum()
+        centre = lengths @ midpoints / length
+        j = lengths @ (lengths**2 / 12 + ((midpoints - centre)**2).sum(axis=1)) / length
+        self._add('line', group, load * length, centre[0], centre[1], j)
+
+
+    def addPoint(self, glob_x:float, glob_y:float, mass:float, group:str='G') -> None:
+        """
+        Adds a point mass such as a piece of equipment.
+
+        Parameters
+        ----------
+        glob_x : float
+            Global x-coordinate.
+        glob_y : float
+            Global y-coordinate.
+        mass : float
+            The mass (or load).
+        group : str, optional
+            The load group (default is 'G').
+
+        Returns
+        -------
+        None
+        """
+        self._add('point', group, mass, glob_x, glob_y, 0.0)
+
+
+    def _pack(self) -> tuple[np.ndarray, ...]:
+        if self._packed is not None:
+            return self._packed
+
+        kinds = [item[0] for item in self._items]
+        groups = [item[1] for item in self._items]
+        mass, x, y, j = np.array(
+            [item[2:] for item in self._items], dtype=float
+            ).reshape(-1, 4).T
+
+        if self._areas:
+            area, centroid, moments = polygon_properties(
+                *pack_polygons([polygon for polygon, _, _ in self._areas])
+                )
+            loads = np.array([load for _, _, load in self._areas])
+            kinds = ['area'] * area.size + kinds
+            groups = [group for _, group, _ in self._areas] + groups
+            mass = np.concatenate((loads * area, mass))
+            x = np.concatenate((centroid[:, 0], x))
+            y = np.concatenate((centroid[:, 1], y))
+            j = np.concatenate(((moments[:, 0] + moments[:, 1]) / area, j))
+
+        group_index = np.array([self._groups.index(group) for group in groups], dtype=int)
+        self._packed = (kinds, group_index, mass, x, y, j)
+        return self._packed
+
+
+    def _factors(self, combinations:dict[str, dict[str, float]]) -> np.ndarray:
+        factors = np.zeros((len(combinations), len(self._groups)))
+        for row, combination in enumerate(combinations.values()):
+            for group, factor in combination.items():
+                if group not in self._groups:
+                    raise KeyError(f"mass model has no load group '{group}'")
+                factors[row, self._groups.index(group)] = factor
+        return factors
+
+
+    def evaluate(self, factors:np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluates many load combinations at once.
+
+        Parameters
+        ----------
+        factors : np.ndarray
+            Factor per combination and load group, shape
+            (combinations, groups), columns in the order of `_groups`.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            The total mass, shape (combinations,), the mass centre, shape
+            (combinations, 2), and the polar mass moment about the mass
+            centre, shape (combinations,).
+        """
+        _, group_index, mass, x, y, j = self._pack()
+        if mass.size == 0:
+            raise ValueError('mass model has no masses')
+        factors = np.atleast_2d(np.asarray(factors, dtype=float))
+        if factors.shape[1] != len(self._groups):
+            raise ValueError(
+                f'factors must have {len(self._groups)} columns, one per load group'
+                )
+
+        # take the moments about the first item, far away coordinates would
+        # otherwise cancel in the polar moment
+        x_0, y_0 = x[0], y[0]
+        dx, dy = x - x_0, y - y_0
+
+        weights = factors[:, group_index] * mass
+        total = weights.sum(axis=1)
+        if (total == 0).any():
+            raise ValueError(
+                f'mass model has no masses in combination(s) {np.flatnonzero(total == 0).tolist()}'
+                )
+        centre_x = weights @ dx / total
+        centre_y = weights @ dy / total
+        polar = weights @ (dx**2 + dy**2 + j) - total * (centre_x**2 + centre_y**2)
+
+        centre = np.column_stack((centre_x + x_0, centre_y + y_0))
+        return total, centre, polar
+
+
+    def massCentre(self, combination:dict[str, float]|None=None) -> np.ndarray:
+        """
+        Returns the mass centre of one load combination.
+
+        Parameters
+        ----------
+        combination : dict, optional
+            Factor per load group, missing groups get 0. By default all
+            groups get the factor 1.
+
+        Returns
+        -------
+        np.ndarray
+            The global mass centre (x, y).
+        """
+        if combination is None:
+            factors = np.ones((1, len(self._groups)))
+        else:
+            factors = self._factors({'': combination})
+        return self.evaluate(factors)[1][0]
+
+
+    def combinationTable(self, combinations:dict[str, dict[str, float]]) -> pd.DataFrame:
+        """
+        Evaluates named load combinations.
+
+        Parameters
+        ----------
+        combinations : dict
+            Factor per load group for every combination name, e.g.
+            `{'G+Q':{'G':1.0, 'Q':1.0}, 'G':{'G':1.0}}`.
+
+        Returns
+        -------
+        pd.DataFrame
+            Mass, mass centre and polar mass moment per combination.
+        """
+        total, centre, polar = self.evaluate(self._factors(combinations))
+        return pd.DataFrame(
+            {
+                'mass':total,
+                'glo x_m':centre[:, 0],
+                'glo y_m':centre[:, 1],
+                'polar moment':polar,
+            },
+            index=pd.Index(list(combinations), name='combination')
+            )
+
+
+    @property
+    def _centre(self) -> np.ndarray:
+        return self.massCentre()
+
+    @property
+    def _polar_moment(self) -> float:
+        return float(self.evaluate(np.ones((1, len(self._groups))))[2][0])
+
+    @property
+    def _table(self) -> pd.DataFrame:
+        kinds, group_index, mass, x, y, _ = self._pack()
+
+        result_table = {
+            'item':kinds,
+            'group':[self._groups[i] for i in group_index],
+            'mass':mass,
+            'glo x':x,
+            'glo y':y,
+        }
+
+        return pd.DataFrame(result_table)
+
+
+    def printTable(self, combinations:dict[str, dict[str, float]]|None=None) -> None:
+        """
+        Prints the items of the mass model and the mass centre, per load
+        combination if given.
+
+        Parameters
+        ----------
+        combinations : dict, optional
+            Load combinations as in `combinationTable`.
+
+        Returns
+        -------
+        None
+        """
+        if combinations is None:
+            summary = (
+                f"glo mass   centre [x,y] : "
+                f"{self._centre[0]:0.4f}, {self._centre[1]:0.4f}\n"
+                f"polar mass moment       : {self._polar_moment:,.1f}\n"
+                )
+        else:
+            summary = f"{self.combinationTable(combinations)}\n"
+        print(f"\n{self._table}\n\n{summary}")
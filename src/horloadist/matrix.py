@@ -0,0 +1,203 @@
+import pandas as pd
+import numpy as np
+
+from .structure import Stucture
+
+
+class MatrixSolve:
+    """
+    A class to represent the linear solver based on the 3x3 stiffness matrix
+    of the storey.
+
+    The storey displacements (ux, uy, rotation) at the mass centre move
+    every node by `T = [[1, 0, -y], [0, 1, x]]`, which the 2x2 stiffness
+    matrix `[[EIy, EIxy], [EIxy, EIx]]` of the node turns into its forces.
+    The storey matrix `sum(T^T k T)` is factorized once and reused for any
+    number of load vectors. Unlike `LinSolve` this takes the coupling
+    stiffness `glob_kxy` of angled walls into account; for orthogonal walls
+    both give the same forces.
+
+    Parameters
+    ----------
+    structure : Stucture
+        The structure object that contains the necessary geometric and
+        stiffness information.
+    x_mass_force : float or np.ndarray, optional
+        The force applied in the x-direction at the mass centre, one value
+        per load case for an array (default is 1).
+    y_mass_force : float or np.ndarray, optional
+        The force applied in the y-direction at the mass centre (default
+        is 1).
+    torsion_Mz : float or np.ndarray, optional
+        An additional torsion moment about the mass centre, e.g. from an
+        accidental eccentricity (default is 0).
+
+    Attributes
+    ----------
+    _structure : Stucture
+        The structure object containing information about the geometry and stiffness.
+    _node_stiffness : np.ndarray
+        The 2x2 stiffness matrices of the nodes, shape (nodes, 2, 2).
+    _node_transformation : np.ndarray
+        The matrices `T` of the nodes, shape (nodes, 2, 3).
+    _stiffness_matrix : np.ndarray
+        The 3x3 stiffness matrix of the storey.
+    _lu : tuple
+        The LU factorization of `_stiffness_matrix`.
+    _displacements : np.ndarray
+        Displacements (ux, uy, rotation) of the mass centre, shape (3,) or
+        (cases, 3).
+    _node_final_Vx : np.ndarray
+        Final nodal forces in the x-direction, shape (nodes,) or (cases, nodes).
+    _node_final_Vy : np.ndarray
+        Final nodal forces in the y-direction, shape (nodes,) or (cases, nodes).
+    _table : pd.DataFrame
+        DataFrame containing the nodal forces, with a 'case' column for
+        several load cases.
+    """
+    def __init__(
+            self,
+            structure:Stucture,
+            x_mass_force:float|np.ndarray=1,
+            y_mass_force:float|np.ndarray=1,
+            torsion_Mz:float|np.ndarray=0
+            ):
+        self._structure = structure
+        self._x_force = x_mass_force
+        self._y_force = y_mass_force
+        self._torsion_Mz = torsion_Mz
+
+        self._main()
+
+
+    def _assemble(self) -> None:
+        structure = self._structure
+        n_nodes = len(structure._nodes)
+        x, y = structure._loc_node_x, structure._loc_node_y
+
+        k = np.zeros((n_nodes, 2, 2))
+        k[:, 0, 0] = structure._state_EIy
+        k[:, 1, 1] = structure._state_EIx
+        k[:, 0, 1] = k[:, 1, 0] = [node._glob_EIxy for node in structure._nodes]
+
+        T = np.zeros((n_nodes, 2, 3))
+        T[:, 0, 0] = 1
+        T[:, 1, 1] = 1
+        T[:, 0, 2] = -y
+        T[:, 1, 2] = x
+
+        self._node_stiffness = k
+        self._node_transformation = T
+        self._stiffness_matrix = np.einsum('nai,nab,nbj->ij', T, k, T)
+
+
+    def _factorize(self) -> None:
+        from scipy.linalg import lu_factor
+
+        self._lu = lu_factor(self._stiffness_matrix)
+
+
+    def solve(
+            self,
+            x_mass_force:float|np.ndarray,
+            y_mass_force:float|np.ndarray,
+            torsion_Mz:float|np.ndarray=0
+            ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Solves further load cases with the existing factorization.
+
+        Parameters
+        ----------
+        x_mass_force : float or np.ndarray
+            The force(s) in the x-direction at the mass centre.
+        y_mass_force : float or np.ndarray
+            The force(s) in the y-direction at the mass centre.
+        torsion_Mz : float or np.ndarray, optional
+            Additional torsion moment(s) about the mass centre (default is 0).
+
+        Returns
+        -------
+        tuple of np.ndarray
+            The displacements, shape (..., 3), and the nodal forces Vx and
+            Vy, shape (..., nodes), where ... is the broadcast shape of the
+            loads.
+        """
+        from scipy.linalg import lu_solve
+
+        loads = np.stack(
+            np.broadcast_arrays(
+                np.asarray(x_mass_force, dtype=float),
+                np.asarray(y_mass_force, dtype=float),
+                np.asarray(torsion_Mz, dtype=float)
+                ),
+            axis=-1
+            )
+        displacements = lu_solve(self._lu, loads.reshape(-1, 3).T).T.reshape(loads.shape)
+
+        node_displacements = np.einsum('nai,...i->...na', self._node_transformation, displacements)
+        V = np.einsum('nab,...nb->...na', self._node_stiffness, node_displacements)
+        return displacements, V[..., 0], V[..., 1]
+
+
+    def _main(self) -> None:
+        self._assemble()
+        self._factorize()
+        self._displacements, self._node_final_Vx, self._node_final_Vy = self.solve(
+            self._x_force, self._y_force, self._torsion_Mz
+            )
+
+
+    @property
+    def _table(self) -> pd.DataFrame:
+        node_numbers = self._structure._node_numbers
+        if self._node_final_Vx.ndim == 1:
+            return pd.DataFrame({
+                'node nr':node_numbers,
+                'Vx':self._node_final_Vx,
+                'Vy':self._node_final_Vy,
+            })
+
+        Vx = self._node_final_Vx.reshape(-1, node_numbers.size)
+        Vy = self._node_final_Vy.reshape(-1, node_numbers.size)
+        n_cases = Vx.shape[0]
+
+        result_table = {
+            'case':np.repeat(np.arange(n_cases), node_numbers.size),
+            'node nr':np.tile(node_numbers, n_cases),
+            'Vx':Vx.ravel(),
+            'Vy':Vy.ravel(),
+        }
+
+        return pd.DataFrame(result_table)
+
+
+    def printTable(self) -> None:
+        """
+        Prints the storey stiffness matrix, the displacements and the nodal
+        forces.
+
+        Returns
+        -------
+        None
+        """
+        print(
+            "\n"
+            f"storey stiffness [ux, uy, rot]:\n{self._stiffness_matrix}\n"
+            f"\ndisplacements [ux, uy, rot]:\n{self._displacements}\n"
+            f"\n{self._table}\n"
+            )
+
+
+    def updateNodes(self) -> None:
+        """
+        Updates the reaction forces (Rx, Ry) for each node in the structure.
+
+        Only possible for a single load case.
+
+        Returns
+        -------
+        None
+        """
+        if self._node_final_Vx.ndim != 1:
+            raise ValueError('updateNodes needs a single load case')
+        self._structure._set_reactions(-self._node_final_Vx, -self._node_final_Vy)
@@ -1,10 +1,14 @@
 import pandas as pd
 import numpy as np
+import warnings
+from typing import Callable
 
-from .node import SupportNode
 from .structure import Stucture
-from .utils import interpolateXY
+from .stiffnesses import StiffnessCurve, StiffnessCache
 from .linsolve import LinSolve
+from .acceleration import Picard, to_accelerator
+from .instrument import PhaseTimer, print_progress
+from .jit import pack_curves, solve_packed
 
 class NonLinSolve:
     """
@@ -22,11 +26,49 @@ class NonLinSolve:
     y_mass_force : float, optional
         The mass force in the y-direction (default is 1).
     iterations : int, optional
-        The number of iterations for the non-linear solution (default is 40).
+        The maximum number of iterations for the non-linear solution, 0
+        only runs the initial linear solution (default is 40).
     z_heigt : float, optional
         The height in the z-direction for moment calculations (default is 1).
     verbose : bool, optional
-        If True, print iteration progress (default is True).
+        If True and no `callback` is given, print iteration progress with
+        `print_progress` (default is True).
+    tol_force : float, optional
+        Tolerance for the largest change of a nodal force between two
+        iterations, relative to the largest nodal force (default is 1e-6).
+    tol_stiffness : float, optional
+        Tolerance for the largest relative change of a nodal stiffness
+        between two iterations (default is 1e-6).
+    tol_centre : float, optional
+        Tolerance for the change of the stiffness centre `x_s`, `y_s`
+        between two iterations, relative to the plan size of the nodes
+        (default is 1e-6).
+    acceleration : str or Picard, optional
+        Update strategy for the nonlinear stiffnesses: 'picard' (plain
+        fixed-point iteration), 'relaxation', 'aitken', 'anderson' or an
+        instance of one of the classes in `horloadist.acceleration` for
+        custom settings (default is 'picard').
+    callback : callable, optional
+        Progress hook called after every iteration as
+        `callback(solver, iteration, residuals)`. The array backends call
+        it once after the last iteration.
+    collector : PhaseTimer, optional
+        Collects call counts and wall times of the solver phases
+        'update_linnodes', 'linsolve', 'record_history', 'residuals' and
+        'build_tracking_df', or 'packed_loop' for the array backends.
+        Without a collector nothing is timed.
+    backend : str, optional
+        'python' runs the iteration on the structure, one step at a time.
+        'numpy' and 'numba' run the whole loop on packed arrays with
+        `horloadist.jit.solve_packed`, compiled with Numba if it is
+        installed and vectorized with NumPy otherwise. The array backends
+        only support 'picard' acceleration (default is 'python').
+    stiffness_cache : StiffnessCache, optional
+        Memoizes the curve evaluations of the 'python' backend at quantized
+        moments. Share one cache between solvers on the same curves to reuse
+        evaluations across load cases. Hits within one solve need a
+        resolution coarser than the default, which quantizes the result, see
+        `StiffnessCache`.
 
     Attributes
     ----------
@@ -37,133 +79,343 @@ class NonLinSolve:
     _y_force : float
         The mass force in the y-direction.
     _iterations : int
-        The number of iterations for the non-linear solution.
+        The maximum number of iterations for the non-linear solution.
+    _tol_force : float
+        Tolerance for the relative change of the nodal forces.
+    _tol_stiffness : float
+        Tolerance for the relative change of the nodal stiffnesses.
+    _tol_centre : float
+        Tolerance for the change of the stiffness centre.
+    _plan_size : float
+        The larger extent of the nodes in x and y, the length scale of the
+        centre residual.
+    _accelerator : Picard
+        The update strategy for the nonlinear stiffnesses.
+    _callback : callable or None
+        The progress hook.
+    _collector : PhaseTimer or None
+        The collector for the phase timings.
+    _backend : str
+        The backend running the iteration.
+    _stiffness_cache : StiffnessCache or None
+        The cache of the curve evaluations.
+    _converged : bool
+        True if all tolerances were met within `_iterations`.
+    _iterations_done : int
+        The number of iterations actually run.
+    _residual_table : pd.DataFrame
+        Residuals 'force', 'stiffness' and 'centre' of every iteration.
     _z_heigt : float
         The height in the z-direction for moment calculations.
     _verbose : bool
         Flag for verbose output.
-    _node_tracker : dict
-        Dictionary to track node properties across iterations.
-    _structure_tracker : dict
-        Dictionary to track structure properties across iterations.
+    _history : np.ndarray
+        Node properties across iterations, preallocated with the shape
+        (iterations + 1, nodes, quantities). Axis 1 is labelled by
+        `_history_nodes`, axis 2 by `HISTORY_QUANTITIES`. Only the rows up
+        to `_iterations_done` are filled.
+    _history_nodes : np.ndarray
+        The node numbers along axis 1 of `_history`.
+    _centre_history : np.ndarray
+        The stiffness centre across iterations, shape (iterations + 1, 2),
+        labelled by `CENTRE_QUANTITIES`.
     _table : pd.DataFrame
-        DataFrame containing all tracked data across iterations.
+        DataFrame containing all tracked data across iterations, built from
+        the history on access.
     _table_onlyUpdates : pd.DataFrame
-        DataFrame containing only the data that changed across iterations.
+        DataFrame containing only the data that changed across iterations,
+        built from the history on access.
     """      
+    HISTORY_QUANTITIES = ('EIx', 'EIy', 'Vx', 'Vy', 'Mx', 'My')
+    CENTRE_QUANTITIES = ('x_s', 'y_s')
+    BACKENDS = ('python', 'numpy', 'numba')
+
     def __init__(
             self,
             structure:Stucture,
             x_mass_force:float=1,
             y_mass_force:float=1,
-            iterations:int=20,
+            iterations:int=40,
             z_heigt:float=1,
-            verbose:bool=True
+            verbose:bool=True,
+            tol_force:float=1e-6,
+            tol_stiffness:float=1e-6,
+            tol_centre:float=1e-6,
+            acceleration:str|Picard='picard',
+            callback:Callable[['NonLinSolve', int, dict], None]|None=None,
+            collector:PhaseTimer|None=None,
+            backend:str='python',
+            stiffness_cache:StiffnessCache|None=None
             ) -> None:
+        structure._warn_decoupled('NonLinSolve')
         self._structure = structure
         self._x_force = x_mass_force
         self._y_force = y_mass_force
         self._iterations = iterations
         self._z_heigt = z_heigt
+        self._tol_force = tol_force
+        self._tol_stiffness = tol_stiffness
+        self._tol_centre = tol_centre
+        self._accelerator = to_accelerator(acceleration)
+
+        if backend not in self.BACKENDS:
+            raise ValueError(
+                f"unknown backend '{backend}', choose from {self.BACKENDS}"
+                )
+        if backend != 'python' and type(self._accelerator) is not Picard:
+            raise ValueError(
+                f"backend '{backend}' only supports 'picard' acceleration"
+                )
+        if backend != 'python' and stiffness_cache is not None:
+            raise ValueError(
+                f"backend '{backend}' does not support a stiffness_cache"
+                )
+        self._backend = backend
+        self._stiffness_cache = stiffness_cache
 
         self._verbose = verbose
+        if callback is None and verbose:
+            callback = print_progress
+        self._callback = callback
+        self._collector = collector
         
         self._main()
 
 
-    def _init_node_tracker(self) -> None:
-        self._node_tracker = {}
-        for node in self._structure._linnodes:
-            self._update_node_tracker(node, init=True)
+    def _phase(self, phase:str, func:Callable, *args):
+        if self._collector is None:
+            return func(*args)
+        return self._collector.time(phase, func, *args)
+
+
+    def _init_plan_size(self) -> None:
+        structure = self._structure
+        extent = 0.0
+        if len(structure._loc_node_x):
+            extent = max(np.ptp(structure._loc_node_x), np.ptp(structure._loc_node_y))
+        # a single node has no extent, fall back to length units
+        self._plan_size = float(extent) if extent > 0 else 1.0
+
+
+    def _init_history(self) -> None:
+        n_rows = self._iterations + 1
+        n_nodes = len(self._structure._linnodes)
+        # np.empty leaves the pages of rows never reached unmapped, so an
+        # early convergence does not pay for the full iteration cap
+        self._history = np.empty((n_rows, n_nodes, len(self.HISTORY_QUANTITIES)))
+        self._centre_history = np.empty((n_rows, len(self.CENTRE_QUANTITIES)))
+        self._history_nodes = np.array(self._structure._node_numbers)
+
+
+    def _record_history(self, row:int) -> None:
+        structure = self._structure
+        z = self._z_heigt
+        Rx, Ry = structure._state_Rx, structure._state_Ry
+
+        # order as in HISTORY_QUANTITIES
+        record = self._history[row]
+        record[:, 0] = structure._state_EIx
+        record[:, 1] = structure._state_EIy
+        record[:, 2] = -Rx
+        record[:, 3] = -Ry
+        record[:, 4] = -Ry * z
+        record[:, 5] = -Rx * z
+
+        self._centre_history[row] = (
+            structure._loc_stiff_centre_x,
+            structure._loc_stiff_centre_y
+            )
 
 
-    def _append_node_tracker(self) -> None:
-        for node in self._structure._linnodes:
-            self._update_node_tracker(node)
+    def _init_nonlinear_nodes(self) -> None:
+        nodes = self._structure._nodes
+        self._nl_index_x = np.array([
+            i for i, node in enumerate(nodes)
+            if isinstance(node._glob_EIx, StiffnessCurve)
+            ], dtype=int)
+        self._nl_index_y = np.array([
+            i for i, node in enumerate(nodes)
+            if isinstance(node._glob_EIy, StiffnessCurve)
+            ], dtype=int)
+        self._nl_curves_x = [nodes[i]._glob_EIx for i in self._nl_index_x]
+        self._nl_curves_y = [nodes[i]._glob_EIy for i in self._nl_index_y]
 
 
-    def _update_node_tracker(self, node:SupportNode, init=False) -> None:
-        TRACKING_REGISTER = {
-            f'node {node._nr} EIx':[node._glob_EIx],
-            f'node {node._nr} EIy':[node._glob_EIy],
-            f'node {node._nr} Vx':[-node._Rx],
-            f'node {node._nr} Vy':[-node._Ry],
-            f'node {node._nr} Mx':[-node._Ry * self._z_heigt],
-            f'node {node._nr} My':[-node._Rx * self._z_heigt]
-        }
-        if init:
-            for key, item in TRACKING_REGISTER.items():
-                self._node_tracker[key] = item
+    def _update_linnodes_inplace(self) -> None:
+        structure = self._structure
+        ix, iy = self._nl_index_x, self._nl_index_y
+
+        Mx = -structure._state_Ry[ix] * self._z_heigt
+        My = -structure._state_Rx[iy] * self._z_heigt
+        if self._stiffness_cache is not None:
+            gx = self._stiffness_cache.evaluateMany(
+                self._nl_curves_x + self._nl_curves_y, np.concatenate((Mx, My))
+                )
         else:
-            for key, item in TRACKING_REGISTER.items():
-                self._node_tracker[key].append(item[0])
+            gx = np.array(
+                [curve(M) for curve, M in zip(self._nl_curves_x, Mx)]
+                + [curve(M) for curve, M in zip(self._nl_curves_y, My)],
+                dtype=float
+                )
+        x = np.concatenate((structure._state_EIx[ix], structure._state_EIy[iy]))
+        x_new = self._accelerator.update(x, gx)
 
+        structure._set_node_stiffnesses(ix, EIx=x_new[:ix.size])
+        structure._set_node_stiffnesses(iy, EIy=x_new[ix.size:])
 
 
-    def _init_structure_tracker(self) -> None:
-        self._structure_tracker = {}
-        self._update_structure_tracker(self._structure, init=True)
-
-
-    def _append_structure_tracker(self) -> None:
-        self._update_structure_tracker(self._structure)
+    def _linsolve_inplace(self) -> None:
+        sol = LinSolve(self._structure, self._x_force, self._y_force)
+        sol.updateNodes()
 
 
-    def _update_structure_tracker(self, structure:Stucture, init=False) -> None:
-        TRACKING_REGISTER = {
-            f'x_s':[structure._loc_stiff_centre_x],
-            f'y_s':[structure._loc_stiff_centre_y],
+    def _residuals(self, row:int) -> dict[str, float]:
+        TINY = np.finfo(float).tiny
+        previous, current = self._history[row-1], self._history[row]
+        EI_0, EI_1 = previous[:, 0:2], current[:, 0:2]
+        V_0, V_1 = previous[:, 2:4], current[:, 2:4]
+        c_0, c_1 = self._centre_history[row-1], self._centre_history[row]
+
+        force_scale = max(np.abs(V_1).max(initial=0.0), TINY)
+        return {
+            'force':float(np.abs(V_1 - V_0).max(initial=0.0) / force_scale),
+            'stiffness':float(
+                (np.abs(EI_1 - EI_0) / np.maximum(np.abs(EI_1), TINY)).max(initial=0.0)
+                ),
+            'centre':float(np.abs(c_1 - c_0).max() / self._plan_size),
         }
-        if init:
-            for key, item in TRACKING_REGISTER.items():
-                self._structure_tracker[key] = item
-        else:
-            for key, item in TRACKING_REGISTER.items():
-                self._structure_tracker[key].append(item[0])
 
 
-    
-        
-    def _update_linnodes_inplace(self) -> None:
-        nodes_and_linnodes = zip(
-            self._structure._nodes,
-            self._structure._linnodes
+    def _is_converged(self, residuals:dict[str, float]) -> bool:
+        return (
+            residuals['force'] <= self._tol_force
+            and residuals['stiffness'] <= self._tol_stiffness
+            and residuals['centre'] <= self._tol_centre
             )
-        for node, linnode in nodes_and_linnodes:
-            if isinstance(node._glob_EIx, pd.DataFrame):
-                linnode._glob_EIx = interpolateXY(
-                    node._glob_EIx,
-                    -linnode._Ry*self._z_heigt
-                    )
-            if isinstance(node._glob_EIy, pd.DataFrame):
-                linnode._glob_EIy = interpolateXY(
-                    node._glob_EIy,
-                    -linnode._Rx*self._z_heigt
-                    )
 
 
-    def _linsolve_inplace(self) -> None:
-        sol = LinSolve(self._structure, self._x_force, self._y_force)
-        sol.updateNodes()
+    def _iterate(self) -> None:
+        self._init_history()
+        self._record_history(0)
+        self._residual_history = []
+        self._accelerator.reset()
+        self._converged = False
+        self._iterations_done = 0
+        for i in range(self._iterations):
+            self._phase('update_linnodes', self._update_linnodes_inplace)
+            self._phase('linsolve', self._linsolve_inplace)
+            self._phase('record_history', self._record_history, i + 1)
+
+            residuals = self._phase('residuals', self._residuals, i + 1)
+            self._residual_history.append(residuals)
+            self._iterations_done = i + 1
+
+            if self._callback is not None:
+                self._callback(self, i + 1, residuals)
+
+            if self._is_converged(residuals):
+                self._converged = True
+                break
+
+        self._warn_not_converged()
+
+
+    def _iterate_packed(self) -> None:
+        structure = self._structure
+        ix, iy = self._nl_index_x, self._nl_index_y
+        knots_mom, knots_EI, offsets, curve_index = pack_curves(
+            self._nl_curves_x + self._nl_curves_y
+            )
 
+        history, centre_history, residuals, done, converged = solve_packed(
+            structure._loc_node_x,
+            structure._loc_node_y,
+            structure._state_EIx,
+            structure._state_EIy,
+            ix,
+            curve_index[:ix.size],
+            iy,
+            curve_index[ix.size:],
+            knots_mom,
+            knots_EI,
+            offsets,
+            self._x_force,
+            self._y_force,
+            self._z_heigt,
+            self._iterations,
+            self._tol_force,
+            self._tol_stiffness,
+            self._tol_centre * self._plan_size,
+            use_numba=self._backend == 'numba'
+            )
 
-    def _iterate(self) -> None:
-        self._init_structure_tracker()
-        self._init_node_tracker()
-        for i, _ in enumerate(range(self._iterations)):
-            if self._verbose:
-                print(f"-> iteration {i+1}/{self._iterations}", end='\r')
-            self._update_linnodes_inplace()
-            self._linsolve_inplace()
-            self._append_structure_tracker()
-            self._append_node_tracker()
+        self._history = history
+        self._centre_history = centre_history
+        self._history_nodes = np.array(structure._node_numbers)
+        residuals[:, 2] /= self._plan_size
+        self._residual_history = [
+            dict(zip(('force', 'stiffness', 'centre'), row))
+            for row in residuals[:done].tolist()
+            ]
+        self._converged = converged
+        self._iterations_done = done
+
+        # leave the structure in the final state, as the python backend does
+        final = history[done]
+        structure._set_node_stiffnesses(ix, EIx=final[ix, 0])
+        structure._set_node_stiffnesses(iy, EIy=final[iy, 1])
+        structure._set_reactions(-final[:, 2], -final[:, 3])
+
+        if self._callback is not None and done > 0:
+            self._callback(self, done, self._residual_history[-1])
+        self._warn_not_converged()
+
+
+    def _warn_not_converged(self) -> None:
+        # without iterations there is nothing to converge
+        if not self._converged and self._iterations_done > 0:
+            warnings.warn(
+                f"NonLinSolve did not converge within {self._iterations} "
+                f"iterations, last residuals: {self._residual_history[-1]}",
+                RuntimeWarning
+                )
+
+
+    def _build_residual_df(self) -> pd.DataFrame:
+        index = pd.RangeIndex(1, self._iterations_done + 1, name='iteration')
+        return pd.DataFrame(
+            self._residual_history,
+            index=index,
+            columns=['force', 'stiffness', 'centre']
+            )
 
 
     def _build_tracking_df(self) -> pd.DataFrame:
-        stru_df = pd.DataFrame(self._structure_tracker)
-        node_df = pd.DataFrame(self._node_tracker)
+        n_rows = self._iterations_done + 1
+        history = self._history[:n_rows]
+        node_columns = [
+            f'node {nr} {quantity}'
+            for nr in self._history_nodes
+            for quantity in self.HISTORY_QUANTITIES
+            ]
+        stru_df = pd.DataFrame(
+            self._centre_history[:n_rows], columns=list(self.CENTRE_QUANTITIES)
+            )
+        node_df = pd.DataFrame(
+            history.reshape(n_rows, -1), columns=node_columns
+            )
         return pd.concat([stru_df, node_df], axis=1)
 
+
+    @property
+    def _table(self) -> pd.DataFrame:
+        return self._phase('build_tracking_df', self._build_tracking_df)
+
+
+    @property
+    def _table_onlyUpdates(self) -> pd.DataFrame:
+        return self._update_nodes_only(self._table)
+
     
     def _update_nodes_only(self, table:pd.DataFrame) -> pd.DataFrame:
         table_onlyUpdates = table.loc[
@@ -221,11 +473,15 @@ class NonLinSolve:
 
     def _main(self) -> None:
 
-        self._linsolve_inplace()
-        self._iterate()
+        self._init_nonlinear_nodes()
+        self._init_plan_size()
+        if self._backend == 'python':
+            self._linsolve_inplace()
+            self._iterate()
+        else:
+            self._phase('packed_loop', self._iterate_packed)
 
-        self._table = self._build_tracking_df()
-        self._table_onlyUpdates = self._update_nodes_only(self._table)
+        self._residual_table = self._build_residual_df()
         
     
 
@@ -1,6 +1,27 @@
 import pandas as pd
+import numpy as np
+import weakref
 
-from .stiffnesses import KX, KY
+from .stiffnesses import KX, KY, StiffnessCurve
+
+
+# curves converted from DataFrames by id of the frame, so that nodes built
+# from the same table share one curve; DataFrames are not hashable
+_FRAME_CURVES:dict[int, tuple[weakref.ref, StiffnessCurve]] = {}
+
+
+def _frame_curve(df:pd.DataFrame) -> StiffnessCurve:
+    key = id(df)
+    entry = _FRAME_CURVES.get(key)
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+
+    def forget(_, key=key) -> None:
+        _FRAME_CURVES.pop(key, None)
+
+    curve = StiffnessCurve.from_frame(df)
+    _FRAME_CURVES[key] = (weakref.ref(df, forget), curve)
+    return curve
 
 
 class SupportNode:
@@ -15,10 +36,18 @@ class SupportNode:
         Global x-coordinate of the node.
     glob_y : float
         Global y-coordinate of the node.
-    glob_EIy : float
-        Global stiffness value along the y-axis (bending stiffness).
-    glob_EIx : float
-        Global stiffness value along the x-axis (bending stiffness).
+    glob_kx : float, StiffnessCurve or pd.DataFrame
+        Global stiffness value along the y-axis (bending stiffness). A
+        DataFrame with 'mom' and 'EI' columns is converted to a
+        StiffnessCurve once, nodes given the same DataFrame share that
+        curve. Later changes to the DataFrame are not picked up.
+    glob_ky : float, StiffnessCurve or pd.DataFrame
+        Global stiffness value along the x-axis (bending stiffness),
+        converted as `glob_kx`.
+    glob_kxy : float, optional
+        Coupling stiffness between the x- and y-direction, e.g. of angled
+        walls, see `SupportNode.angled`. Only `MatrixSolve` and
+        `CoupledBuilding` take it into account (default is 0).
 
     Attributes
     ----------
@@ -28,31 +57,191 @@ class SupportNode:
         Global x-coordinate of the node.
     _glob_y : float
         Global y-coordinate of the node.
-    _glob_EIy : float
+    _glob_EIy : float or StiffnessCurve
         Stiffness along the y-axis.
-    _glob_EIx : float
+    _glob_EIx : float or StiffnessCurve
         Stiffness along the x-axis.
+    _glob_EIxy : float
+        Coupling stiffness between the x- and y-direction.
     _Rx : float, optional
         Reaction force along the x-axis at the node, initialized to None.
     _Ry : float, optional
         Reaction force along the y-axis at the node, initialized to None.
     """
+    __slots__ = (
+        '_nr', '_glob_x', '_glob_y', '_glob_EIy', '_glob_EIx', '_glob_EIxy', '_Rx', '_Ry'
+        )
+
     def __init__(
             self,
             nr:int,
             glob_x:float,
             glob_y:float,
-            glob_kx:float|pd.DataFrame,
-            glob_ky:float|pd.DataFrame
+            glob_kx:float|StiffnessCurve|pd.DataFrame,
+            glob_ky:float|StiffnessCurve|pd.DataFrame,
+            glob_kxy:float=0.0
             ):
         self._nr = nr
         self._glob_x = glob_x
         self._glob_y = glob_y
-        self._glob_EIy = glob_kx
-        self._glob_EIx = glob_ky
+        self._glob_EIy = self._to_stiffness(glob_kx)
+        self._glob_EIx = self._to_stiffness(glob_ky)
+        self._glob_EIxy = glob_kxy
 
         # updated via Solvers
         self._Rx = 0.0
         self._Ry = 0.0
 
 
+    @classmethod
+    def angled(
+            cls,
+            nr:int,
+            glob_x:float,
+            glob_y:float,
+            k_u:float,
+            k_v:float,
+            angle_from_x:float
+            ) -> 'SupportNode':
+        """
+        Creates a node for a wall whose principal axes are rotated.
+
+        Parameters
+        ----------
+        nr : int
+            Node number (identifier).
+        glob_x : float
+            Global x-coordinate of the node.
+        glob_y : float
+            Global y-coordinate of the node.
+        k_u : float
+            Stiffness against forces along the principal axis u, e.g.
+            `KX.constRectangular` of the unrotated wall.
+        k_v : float
+            Stiffness against forces perpendicular to u.
+        angle_from_x : float
+            Angle between the global x-axis and u in degrees,
+            counter-clockwise.
+
+        Returns
+        -------
+        SupportNode
+        """
+        angle = np.radians(angle_from_x)
+        c, s = np.cos(angle), np.sin(angle)
+        return cls(
+            nr,
+            glob_x,
+            glob_y,
+            glob_kx=k_u * c**2 + k_v * s**2,
+            glob_ky=k_u * s**2 + k_v * c**2,
+            glob_kxy=(k_u - k_v) * s * c
+            )
+
+
+    @staticmethod
+    def _to_stiffness(
+            k:float|StiffnessCurve|pd.DataFrame
+            ) -> float|StiffnessCurve:
+        if isinstance(k, pd.DataFrame):
+            return _frame_curve(k)
+        return k
+
+
+class LinearNode:
+    """
+    A view on the linear state of one node inside a structure.
+
+    The state itself (position, linear stiffnesses, reactions) is stored in
+    the arrays of the owning structure; the input `SupportNode` and its
+    stiffness curves are never copied or modified. Setting the position or
+    a stiffness goes through the structure, which invalidates its cached
+    derived quantities if the value actually changed.
+
+    Parameters
+    ----------
+    structure : Stucture
+        The structure owning the state arrays.
+    index : int
+        The position of the node in the structure's arrays.
+
+    Attributes
+    ----------
+    _nr : int
+        Node number (identifier).
+    _glob_x : float
+        Global x-coordinate of the node.
+    _glob_y : float
+        Global y-coordinate of the node.
+    _glob_EIy : float
+        Linear stiffness along the y-axis.
+    _glob_EIx : float
+        Linear stiffness along the x-axis.
+    _Rx : float
+        Reaction force along the x-axis at the node.
+    _Ry : float
+        Reaction force along the y-axis at the node.
+    """
+    __slots__ = ('_structure', '_index')
+
+    def __init__(self, structure, index:int):
+        self._structure = structure
+        self._index = index
+
+    @property
+    def _nr(self) -> int:
+        return self._structure._state_nr[self._index].item()
+
+    @property
+    def _glob_x(self) -> float:
+        return float(self._structure._state_x[self._index])
+
+    @_glob_x.setter
+    def _glob_x(self, value:float) -> None:
+        self._structure._set_node_position(self._index, glob_x=value)
+
+    @property
+    def _glob_y(self) -> float:
+        return float(self._structure._state_y[self._index])
+
+    @_glob_y.setter
+    def _glob_y(self, value:float) -> None:
+        self._structure._set_node_position(self._index, glob_y=value)
+
+    @property
+    def _glob_EIx(self) -> float:
+        return float(self._structure._state_EIx[self._index])
+
+    @_glob_EIx.setter
+    def _glob_EIx(self, value:float) -> None:
+        self._structure._set_node_stiffness(self._index, EIx=value)
+
+    @property
+    def _glob_EIy(self) -> float:
+        return float(self._structure._state_EIy[self._index])
+
+    @_glob_EIy.setter
+    def _glob_EIy(self, value:float) -> None:
+        self._structure._set_node_stiffness(self._index, EIy=value)
+
+    @property
+    def _Rx(self) -> float:
+        return float(self._structure._state_Rx[self._index])
+
+    @_Rx.setter
+    def _Rx(self, value:float) -> None:
+        self._structure._state_Rx[self._index] = value
+
+    @property
+    def _Ry(self) -> float:
+        return float(self._structure._state_Ry[self._index])
+
+    @_Ry.setter
+    def _Ry(self, value:float) -> None:
+        self._structure._state_Ry[self._index] = value
+
+    def __repr__(self) -> str:
+        return (
+            f"LinearNode(nr={self._nr}, x={self._glob_x}, y={self._glob_y}, "
+            f"EIx={self._glob_EIx}, EIy={self._glob_EIy})"
+            )
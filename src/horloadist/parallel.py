@@ -0,0 +1,188 @@
+import pandas as pd
+import numpy as np
+import os
+
+from .structure import Stucture
+from .nlsolve import NonLinSolve
+from .instrument import PhaseTimer
+
+
+_WORKER_STRUCTURE:Stucture|None = None
+
+
+def _init_worker(structure:Stucture) -> None:
+    global _WORKER_STRUCTURE
+    _WORKER_STRUCTURE = structure
+
+
+def _solve_case(
+        structure:Stucture,
+        x_mass_force:float,
+        y_mass_force:float,
+        z_heigt:float,
+        solver_kwargs:dict,
+        timed:bool
+        ) -> tuple[pd.DataFrame, pd.DataFrame, bool, int, PhaseTimer|None]:
+    collector = PhaseTimer() if timed else None
+    sol = NonLinSolve(
+        structure._copy(),
+        x_mass_force,
+        y_mass_force,
+        z_heigt=z_heigt,
+        verbose=False,
+        collector=collector,
+        **solver_kwargs
+        )
+    table = sol._table
+    return table, sol._residual_table, sol._converged, sol._iterations_done, collector
+
+
+def _solve_case_in_worker(args:tuple[float, float, float, dict, bool]) -> tuple:
+    return _solve_case(_WORKER_STRUCTURE, *args)
+
+
+class NonLinBatchSolve:
+    """
+    A class to run many independent nonlinear load cases of one structure.
+
+    Every load case is solved by `NonLinSolve` on its own copy of the
+    structure, so the structure passed in is never modified. With more than
+    one worker the cases are distributed over a process pool; the structure
+    is sent to every worker process once.
+
+    Parameters
+    ----------
+    structure : Stucture
+        The structural model to be analyzed.
+    mass_forces : array_like
+        The forces (Fx, Fy) applied at the mass centre, one row per load
+        case, shape (cases, 2).
+    z_heigt : float or array_like, optional
+        The height for the moment calculations, either one value for all
+        load cases or one per load case (default is 1).
+    max_workers : int or None, optional
+        Number of worker processes. None uses all cores, 1 solves the cases
+        one after another in this process (default is None).
+    collector : PhaseTimer, optional
+        Collects the phase timings of all load cases, including those
+        solved in worker processes.
+    **solver_kwargs
+        Further keyword arguments passed to every `NonLinSolve`, e.g.
+        `iterations`, `tol_force` or `acceleration`.
+
+    Attributes
+    ----------
+    _structure : Stucture
+        The structural model being analyzed.
+    _x_forces : np.ndarray
+        Mass forces in the x-direction, shape (cases,).
+    _y_forces : np.ndarray
+        Mass forces in the y-direction, shape (cases,).
+    _z_heigts : np.ndarray
+        Heights for the moment calculations, shape (cases,).
+    _converged : np.ndarray
+        Convergence flag of every load case.
+    _iterations_done : np.ndarray
+        Number of iterations run for every load case.
+    _table : pd.DataFrame
+        The iteration tables of all load cases, indexed by
+        ('case', 'iteration').
+    _residual_table : pd.DataFrame
+        The residual tables of all load cases, indexed by
+        ('case', 'iteration').
+    """
+    def __init__(
+            self,
+            structure:Stucture,
+            mass_forces:np.ndarray|list[tuple[float, float]],
+            z_heigt:float|np.ndarray|list[float]=1,
+            max_workers:int|None=None,
+            collector:PhaseTimer|None=None,
+            **solver_kwargs
+            ) -> None:
+        forces = np.atleast_2d(np.asarray(mass_forces, dtype=float))
+        if forces.ndim != 2 or forces.shape[1] != 2:
+            raise ValueError(
+                f'mass_forces must have the shape (cases, 2), got {forces.shape}'
+                )
+        n_cases = forces.shape[0]
+        # checked here, the workers receive the structure with the flag set
+        structure._warn_decoupled('NonLinBatchSolve')
+
+        self._structure = structure
+        self._x_forces = forces[:, 0]
+        self._y_forces = forces[:, 1]
+        self._z_heigts = np.broadcast_to(
+            np.asarray(z_heigt, dtype=float), (n_cases,)
+            ).copy()
+        self._max_workers = max_workers
+        self._solver_kwargs = solver_kwargs
+        self._collector = collector
+
+        self._main()
+
+
+    def _case_args(self) -> list[tuple[float, float, float, dict, bool]]:
+        timed = self._collector is not None
+        return [
+            (float(fx), float(fy), float(z), self._solver_kwargs, timed)
+            for fx, fy, z in zip(self._x_forces, self._y_forces, self._z_heigts)
+            ]
+
+
+    def _run(self) -> list[tuple]:
+        args = self._case_args()
+        workers = self._max_workers or os.cpu_count() or 1
+        workers = min(workers, len(args))
+
+        if workers <= 1:
+            return [_solve_case(self._structure, *arg) for arg in args]
+
+        # imported here as it pulls in multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, len(args) // (4 * workers))
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self._structure,)
+                ) as executor:
+            return list(executor.map(_solve_case_in_worker, args, chunksize=chunksize))
+
+
+    def _main(self) -> None:
+        results = self._run()
+        cases = range(len(results))
+
+        self._table = pd.concat(
+            [res[0] for res in results], keys=cases, names=['case', 'iteration']
+            )
+        self._residual_table = pd.concat(
+            [res[1] for res in results], keys=cases, names=['case', 'iteration']
+            )
+        self._converged = np.array([res[2] for res in results], dtype=bool)
+        self._iterations_done = np.array([res[3] for res in results], dtype=int)
+
+        if self._collector is not None:
+            for res in results:
+                self._collector.merge(res[4])
+
+
+    def printSummary(self) -> None:
+        """
+        Prints the forces, convergence state and iteration count of every
+        load case.
+
+        Returns
+        -------
+        None
+        """
+        summary = pd.DataFrame({
+            'Fx':self._x_forces,
+            'Fy':self._y_forces,
+            'z':self._z_heigts,
+            'converged':self._converged,
+            'iterations':self._iterations_done,
+        })
+        summary.index.name = 'case'
+        print(f"\n{summary}\n")
@@ -1,57 +1,221 @@
 import numpy as np
+from functools import cached_property
+
+
+def polygon_properties(
+        coords:np.ndarray,
+        ring_offsets:np.ndarray,
+        polygon_offsets:np.ndarray|None=None,
+        is_hole:np.ndarray|None=None
+        ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Computes area, centroid and second moments of many polygons at once.
+
+    All rings of all polygons are packed into one coordinate array. The
+    orientation of a ring does not matter: outer rings add, holes subtract.
+
+    Parameters
+    ----------
+    coords : np.ndarray
+        Vertices of all rings one after another, shape (vertices, 2). A
+        ring is closed implicitly, its first vertex need not be repeated.
+    ring_offsets : np.ndarray
+        Ring `r` is `coords[ring_offsets[r]:ring_offsets[r+1]]`, shape
+        (rings + 1,).
+    polygon_offsets : np.ndarray, optional
+        Polygon `p` consists of the rings
+        `polygon_offsets[p]:polygon_offsets[p+1]`, shape (polygons + 1,).
+        By default every ring is a polygon of its own.
+    is_hole : np.ndarray, optional
+        Boolean flag per ring, True for holes. By default there are none.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        The areas, shape (polygons,), the centroids, shape (polygons, 2),
+        and the second moments of area `Ix = int y^2 dA`, `Iy = int x^2 dA`
+        and `Ixy = int xy dA` about the centroid, shape (polygons, 3).
+    """
+    coords = np.asarray(coords, dtype=float)
+    ring_offsets = np.asarray(ring_offsets, dtype=np.int64)
+    n_rings = ring_offsets.size - 1
+    if polygon_offsets is None:
+        polygon_offsets = np.arange(n_rings + 1)
+    polygon_offsets = np.asarray(polygon_offsets, dtype=np.int64)
+    n_polygons = polygon_offsets.size - 1
+
+    ring_of_vertex = np.repeat(np.arange(n_rings), np.diff(ring_offsets))
+    polygon_of_ring = np.repeat(np.arange(n_polygons), np.diff(polygon_offsets))
+
+    # integrate relative to the first vertex of each polygon, far away
+    # coordinates would otherwise cancel in the second moments
+    origin = coords[ring_offsets[polygon_offsets[:-1]]]
+    xy = coords - origin[polygon_of_ring[ring_of_vertex]]
+
+    following = np.arange(1, coords.shape[0] + 1)
+    ends = ring_offsets[1:][np.diff(ring_offsets) > 0]
+    starts = ring_offsets[:-1][np.diff(ring_offsets) > 0]
+    following[ends - 1] = starts
+
+    x0, y0 = xy[:, 0], xy[:, 1]
+    x1, y1 = xy[following, 0], xy[following, 1]
+    cross = x0*y1 - x1*y0
+    edge_terms = (
+        cross / 2,
+        cross * (x0 + x1) / 6,
+        cross * (y0 + y1) / 6,
+        cross * (y0*y0 + y0*y1 + y1*y1) / 12,
+        cross * (x0*x0 + x0*x1 + x1*x1) / 12,
+        cross * (x0*y1 + 2*x0*y0 + 2*x1*y1 + x1*y0) / 24,
+        )
+    ring_terms = np.array([
+        np.bincount(ring_of_vertex, weights=term, minlength=n_rings)
+        for term in edge_terms
+        ]).reshape(len(edge_terms), n_rings)
+
+    degenerate = np.flatnonzero(ring_terms[0] == 0)
+    if degenerate.size:
+        raise ValueError(f'ring(s) {degenerate.tolist()} have zero area')
+
+    # orient outer rings counter-clockwise and holes clockwise
+    sign = np.sign(ring_terms[0])
+    if is_hole is not None:
+        sign = np.where(np.asarray(is_hole, dtype=bool), -sign, sign)
+    ring_terms *= sign
+
+    A, S_x, S_y, I_yy, I_xx, I_xy = np.array([
+        np.bincount(polygon_of_ring, weights=term, minlength=n_polygons)
+        for term in ring_terms
+        ]).reshape(len(edge_terms), n_polygons)
+
+    empty = np.flatnonzero(A <= 0)
+    if empty.size:
+        raise ValueError(f'polygon(s) {empty.tolist()} have no area left outside the holes')
+
+    cx, cy = S_x / A, S_y / A
+    centroid = np.column_stack((cx, cy)) + origin
+    second_moments = np.column_stack((
+        I_yy - A * cy**2,
+        I_xx - A * cx**2,
+        I_xy - A * cx * cy,
+        ))
+    return A, centroid, second_moments
+
+
+def pack_polygons(
+        polygons:list['Polygon']
+        ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Packs polygons for `polygon_properties`.
+
+    Parameters
+    ----------
+    polygons : list of Polygon
+        The polygons to pack.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        `coords`, `ring_offsets`, `polygon_offsets` and `is_hole`.
+    """
+    rings = [ring for polygon in polygons for ring in polygon._rings]
+    is_hole = np.array([hole for polygon in polygons for hole in polygon._ring_is_hole], dtype=bool)
+
+    ring_offsets = np.zeros(len(rings) + 1, dtype=np.int64)
+    np.cumsum([ring.shape[0] for ring in rings], out=ring_offsets[1:])
+    polygon_offsets = np.zeros(len(polygons) + 1, dtype=np.int64)
+    np.cumsum([len(polygon._rings) for polygon in polygons], out=polygon_offsets[1:])
+
+    coords = np.concatenate(rings) if rings else np.empty((0, 2))
+    return coords, ring_offsets, polygon_offsets, is_hole
 
 
 class Polygon:
     """
     A class to represent a polygon and compute its geometric properties such as
-    area and centroid.
+    area, centroid and second moments of area.
+
+    The derived values are computed once on first access, a polygon is not
+    meant to be changed afterwards. For many polygons at once use
+    `pack_polygons` and `polygon_properties`.
 
     Parameters
     ----------
     glob_xy : list of tuple of float
         A list of 2D points (x, y coordinates) that define the vertices of
         the polygon.
-    
+    holes : list of list of tuple of float, optional
+        Vertices of openings such as atriums or shafts, which are cut out of
+        the polygon.
+
     Attributes
     ----------
     _xy : list of tuple of float
         List of x and y coordinates representing the vertices of the polygon.
-    _xy_closed_polygon : np.ndarray
-        A closed polygon by appending the first point to the end.
-    _triangle_areas : np.ndarray
-        Areas of the triangles formed between consecutive polygon vertices.
-    _triangle_centroids : np.ndarray
-        Centroids of the triangles formed between consecutive polygon vertices.
+    _rings : list of np.ndarray
+        The outlines and holes of all parts, each of shape (vertices, 2).
+    _ring_is_hole : list of bool
+        True for the entries of `_rings` that are holes.
     area : np.float64
-        The total area of the polygon.
+        The total area of the polygon, without the holes.
     centroid : np.ndarray
         The centroid (geometric center) of the polygon.
+    second_moments : np.ndarray
+        The second moments of area `Ix`, `Iy` and `Ixy` about the centroid.
+    polar_moment : np.float64
+        The polar moment of area `Ix + Iy` about the centroid.
     """
-    def __init__(self, glob_xy:list[list[float|int]]):
+    def __init__(
+            self,
+            glob_xy:list[list[float|int]],
+            holes:list[list[list[float|int]]]|None=None
+            ):
         self._xy = glob_xy
+        self._rings = [np.asarray(glob_xy, dtype=float).reshape(-1, 2)]
+        self._ring_is_hole = [False]
+        for hole in [] if holes is None else holes:
+            self._rings.append(np.asarray(hole, dtype=float).reshape(-1, 2))
+            self._ring_is_hole.append(True)
+
+
+    @classmethod
+    def from_parts(cls, parts:list['Polygon']) -> 'Polygon':
+        """
+        Combines several polygons, e.g. separate slab areas of one storey,
+        into one polygon.
+
+        Parameters
+        ----------
+        parts : list of Polygon
+            The parts, each with its own holes.
+
+        Returns
+        -------
+        Polygon
+        """
+        polygon = cls(parts[0]._xy)
+        polygon._rings = [ring for part in parts for ring in part._rings]
+        polygon._ring_is_hole = [hole for part in parts for hole in part._ring_is_hole]
+        return polygon
+
+
+    @cached_property
+    def _properties(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        coords, ring_offsets, polygon_offsets, is_hole = pack_polygons([self])
+        return polygon_properties(coords, ring_offsets, polygon_offsets, is_hole)
 
-    @property
-    def _xy_closed_polygon(self) -> np.ndarray:
-        return np.vstack((self._xy, self._xy[0]))
-    
-    @property
-    def _triangle_areas(self) -> np.ndarray:
-        xy = self._xy_closed_polygon
-        return np.cross(xy[:-1], xy[1:]) / 2
-    
     @property
     def area(self) -> np.float64:
-        return abs(np.sum(self._triangle_areas))
-    
-    @property
-    def _triangle_centroids(self) -> np.ndarray:
-        xy = self._xy_closed_polygon
-        return (xy[:-1] + xy[1:]) / 3
+        return self._properties[0][0]
 
     @property
     def centroid(self) -> np.ndarray:
-        tri_areas = self._triangle_areas
-        tri_centr = self._triangle_centroids
-        statical_moments = np.sum(tri_areas[:, np.newaxis] * tri_centr, axis=0)
-        centroid = statical_moments / self.area
-        return centroid
\ No newline at end of file
+        return self._properties[1][0].copy()
+
+    @property
+    def second_moments(self) -> np.ndarray:
+        return self._properties[2][0].copy()
+
+    @property
+    def polar_moment(self) -> np.float64:
+        return self.second_moments[0] + self.second_moments[1]
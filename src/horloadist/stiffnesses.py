@@ -1,4 +1,274 @@
 import pandas as pd
+import numpy as np
+from collections import OrderedDict
+
+
+class StiffnessCurve:
+    """
+    A piecewise linear moment-stiffness curve of a single wall.
+
+    The knots are sorted once on construction, so an evaluation is a plain
+    `np.interp` lookup. Moments outside the knot range are extrapolated
+    linearly from the first and last segment.
+
+    Parameters
+    ----------
+    mom : array_like
+        Moments at the knots of the curve.
+    EI : array_like
+        Bending stiffnesses at the knots of the curve.
+
+    Attributes
+    ----------
+    _mom : np.ndarray
+        Sorted moments at the knots.
+    _EI : np.ndarray
+        Bending stiffnesses belonging to `_mom`.
+    _slope_lower : float
+        Slope used for extrapolation below the first knot.
+    _slope_upper : float
+        Slope used for extrapolation above the last knot.
+    """
+    def __init__(self, mom:np.ndarray|list[float], EI:np.ndarray|list[float]):
+        mom = np.asarray(mom, dtype=float)
+        EI = np.asarray(EI, dtype=float)
+
+        if mom.shape != EI.shape or mom.ndim != 1:
+            raise ValueError('mom and EI must be 1d arrays of equal length')
+
+        valid = ~(np.isnan(mom) | np.isnan(EI))
+        order = np.argsort(mom[valid], kind='stable')
+        self._mom = mom[valid][order]
+        self._EI = EI[valid][order]
+
+        if self._mom.size < 2:
+            raise ValueError('a stiffness curve needs at least two knots')
+
+        self._slope_lower = self._slope(0, 1)
+        self._slope_upper = self._slope(-2, -1)
+
+
+    def _slope(self, i:int, j:int) -> float:
+        dmom = self._mom[j] - self._mom[i]
+        if dmom == 0:
+            return 0.0
+        return float((self._EI[j] - self._EI[i]) / dmom)
+
+
+    @classmethod
+    def from_frame(
+            cls,
+            df:pd.DataFrame,
+            momColName:str='mom',
+            EIColName:str='EI'
+            ) -> 'StiffnessCurve':
+        """
+        Creates a curve from two columns of a DataFrame.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Table containing the moment and stiffness columns.
+        momColName : str, optional
+            Name of the moment column (default is 'mom').
+        EIColName : str, optional
+            Name of the stiffness column (default is 'EI').
+
+        Returns
+        -------
+        StiffnessCurve
+        """
+        return cls(df[momColName].to_numpy(), df[EIColName].to_numpy())
+
+
+    def __call__(self, mom:float|np.ndarray) -> float|np.ndarray:
+        """
+        Evaluates the stiffness at one or many moments.
+
+        Parameters
+        ----------
+        mom : float or np.ndarray
+            Moment(s) to evaluate the curve at.
+
+        Returns
+        -------
+        float or np.ndarray
+            The stiffness, with the same shape as `mom`.
+        """
+        mom_arr = np.asarray(mom, dtype=float)
+        EI = np.interp(mom_arr, self._mom, self._EI)
+
+        below = mom_arr < self._mom[0]
+        above = mom_arr > self._mom[-1]
+        EI = np.where(
+            below, self._EI[0] + self._slope_lower * (mom_arr - self._mom[0]), EI
+            )
+        EI = np.where(
+            above, self._EI[-1] + self._slope_upper * (mom_arr - self._mom[-1]), EI
+            )
+
+        if EI.ndim == 0:
+            return float(EI)
+        return EI
+
+
+    def __repr__(self) -> str:
+        return (
+            f"StiffnessCurve({self._mom.size} knots, "
+            f"mom=[{self._mom[0]:,.1f}, {self._mom[-1]:,.1f}])"
+            )
+
+
+class StiffnessCache:
+    """
+    A bounded least-recently-used cache of stiffness curve evaluations.
+
+    Moments are rounded to multiples of `resolution` and the curve is
+    evaluated at the rounded moment, so nearby moments on the same curve
+    share one entry and the result does not depend on the order of the
+    lookups. Entries are keyed by the identity of the curve; the cache keeps
+    a reference to every curve it holds an entry for.
+
+    Choose `resolution` relative to the moments the curves see, not as an
+    absolute number. At the default 1e-6 the moments are practically exact:
+    results match the uncached solver, but the moments of one nonlinear
+    solve never repeat, so hits only come from repeated or similar load
+    cases. A coarser step, around 1e-5 to 1e-4 of the largest moment, also
+    hits within one solve once the iteration settles, but turns the curves
+    into steps of that width. On `examples/NONLIN_main.py` (moments up to
+    about 3800) a step of 1.0 gives hits in late iterations and moves the
+    forces by about 4e-5 relative. The iteration may then stop early,
+    because the stiffnesses stop changing on a step. It may also alternate
+    between neighbouring steps up to the iteration cap: 0.1 does so with
+    plain Picard.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of entries (default is 100000).
+    resolution : float, optional
+        Moment step of the quantization, in the units of the curves, see
+        above (default is 1e-6).
+
+    Attributes
+    ----------
+    _entries : OrderedDict
+        (curve, EI) by (id(curve), quantized moment), least recently used
+        first.
+    _hits : int
+        Number of lookups served from the cache.
+    _misses : int
+        Number of lookups that evaluated a curve.
+    _evictions : int
+        Number of entries dropped because the cache was full.
+    _hit_rate : float
+        Share of the lookups served from the cache.
+    """
+    def __init__(self, maxsize:int=100_000, resolution:float=1e-6) -> None:
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        if resolution <= 0:
+            raise ValueError('resolution must be positive')
+        self._maxsize = maxsize
+        self._resolution = resolution
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def evaluate(self, curve:StiffnessCurve, mom:float) -> float:
+        """
+        Evaluates a curve at the quantized moment.
+
+        Parameters
+        ----------
+        curve : StiffnessCurve
+            The curve to evaluate.
+        mom : float
+            The moment.
+
+        Returns
+        -------
+        float
+            The stiffness.
+        """
+        step = round(mom / self._resolution)
+        key = (id(curve), step)
+        entries = self._entries
+        try:
+            EI = entries[key][1]
+        except KeyError:
+            self._misses += 1
+            EI = curve(step * self._resolution)
+            entries[key] = (curve, EI)
+            if len(entries) > self._maxsize:
+                entries.popitem(last=False)
+                self._evictions += 1
+            return EI
+        self._hits += 1
+        entries.move_to_end(key)
+        return EI
+
+
+    def evaluateMany(
+            self,
+            curves:list[StiffnessCurve],
+            moms:np.ndarray|list[float]
+            ) -> np.ndarray:
+        """
+        Evaluates `curves[i]` at `moms[i]` for all i.
+
+        Returns
+        -------
+        np.ndarray
+            The stiffnesses.
+        """
+        evaluate = self.evaluate
+        return np.array(
+            [evaluate(curve, mom) for curve, mom in zip(curves, np.asarray(moms).tolist())],
+            dtype=float
+            )
+
+
+    def clear(self) -> None:
+        """
+        Removes all entries and resets the statistics.
+
+        Returns
+        -------
+        None
+        """
+        self._entries.clear()
+        self._hits = self._misses = self._evictions = 0
+
+
+    @property
+    def _hit_rate(self) -> float:
+        lookups = self._hits + self._misses
+        return self._hits / lookups if lookups else 0.0
+
+
+    def printStats(self) -> None:
+        """
+        Prints size and hit/miss statistics of the cache.
+
+        Returns
+        -------
+        None
+        """
+        print(
+            "\n"
+            f"entries                 : {len(self._entries):,} / {self._maxsize:,}\n"
+            f"resolution              : {self._resolution:g}\n"
+            f"hits, misses            : {self._hits:,}, {self._misses:,}\n"
+            f"hit rate                : {self._hit_rate:0.2%}\n"
+            f"evictions               : {self._evictions:,}\n"
+            )
 
 
 class KX:
@@ -11,10 +281,9 @@ class KX:
         return E_mod * dy_glob * dx_glob**3 / 12 #EIy
     
     @staticmethod
-    def from_csv(csv_path:str, momYColName:str, EIYColName:str) -> pd.DataFrame:
-        df_all = pd.read_csv(csv_path)
-        df_momEIy = df_all[[momYColName, EIYColName]]
-        return df_momEIy
+    def from_csv(csv_path:str, momYColName:str, EIYColName:str) -> StiffnessCurve:
+        df_momEIy = pd.read_csv(csv_path, usecols=[momYColName, EIYColName])
+        return StiffnessCurve.from_frame(df_momEIy, momYColName, EIYColName)
     
     
 class KY:
@@ -27,7 +296,6 @@ class KY:
         return E_mod * dx_glob * dy_glob**3 / 12 #EIx
     
     @staticmethod
-    def from_csv(csv_path:str, momXColName:str, EIXColName:str) -> pd.DataFrame:
-        df_all = pd.read_csv(csv_path)
-        df_momEIy = df_all[[momXColName, EIXColName]]
-        return df_momEIy
\ No newline at end of file
+    def from_csv(csv_path:str, momXColName:str, EIXColName:str) -> StiffnessCurve:
+        df_momEIx = pd.read_csv(csv_path, usecols=[momXColName, EIXColName])
+        return StiffnessCurve.from_frame(df_momEIx, momXColName, EIXColName)
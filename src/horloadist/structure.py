@@ -1,11 +1,14 @@
 import pandas as pd
 import numpy as np
-from copy import deepcopy
+import warnings
+from copy import copy
+from typing import Callable
 
 from .polygon import Polygon
-from .stiffnesses import KX, KY
-from .node import SupportNode
-from .utils import interpolateXY
+from .mass import MassModel
+from .stiffnesses import KX, KY, StiffnessCurve
+from .node import SupportNode, LinearNode
+from . import kernel
 
 class Stucture:
     """
@@ -17,131 +20,512 @@ class Stucture:
         The polygon that defines the structural geometry.
     nodes : list of SupportNode
         A list of support nodes associated with the structure.
+    glo_mass_centre : tuple of float, np.ndarray or MassModel
+        The global mass centre, e.g. `Polygon.centroid`, or a mass model
+        whose mass centre is taken with all load group factors 1.
     
     Attributes
     ----------
     _polygon : Polygon
         The polygon object representing the structural geometry.
     _nodes : list of SupportNode
-        List of support nodes forming the structure.
-    _node_numbers : pd.Series
-        Series representing the node numbers of the structure.
-    _node_x : pd.Series
-        Series representing the x-coordinates of the nodes.
-    _node_y : pd.Series
-        Series representing the y-coordinates of the nodes.
-    _node_EIy : pd.Series
-        Series representing the flexural stiffness of nodes along the y-axis.
-    _node_EIx : pd.Series
-        Series representing the flexural stiffness of nodes along the x-axis.
-    _node_diff_x_xm : pd.Series
-        Series representing the difference between node x-coordinates and the
+        List of support nodes forming the structure. The nodes and their
+        stiffness curves are shared by reference and never modified.
+    _linnodes : list of LinearNode
+        Views on the linear state of every node, stored in the `_state_*`
+        arrays of the structure.
+    _node_numbers : np.ndarray
+        Array of the node numbers of the structure.
+    _node_x : np.ndarray
+        Array of the x-coordinates of the nodes.
+    _node_y : np.ndarray
+        Array of the y-coordinates of the nodes.
+    _node_EIy : np.ndarray
+        Array of the flexural stiffness of nodes along the y-axis.
+    _node_EIx : np.ndarray
+        Array of the flexural stiffness of nodes along the x-axis.
+    _node_diff_x_xm : np.ndarray
+        Array of the difference between node x-coordinates and the
         polygon centroid x-coordinate.
-    _node_diff_y_ym : pd.Series
-        Series representing the difference between node y-coordinates and the
+    _node_diff_y_ym : np.ndarray
+        Array of the difference between node y-coordinates and the
         polygon centroid y-coordinate.
     _stiff_centre_x : float
         The x-coordinate of the stiffness center of the structure.
     _stiff_centre_y : float
         The y-coordinate of the stiffness center of the structure.
-    _node_diff_xs_xm : pd.Series
-        Series representing the difference between the stiffness center
+    _node_diff_xs_xm : np.ndarray
+        Array of the difference between the stiffness center
         x-coordinate and node x-coordinates.
-    _node_diff_ys_ym : pd.Series
-        Series representing the difference between the stiffness center
+    _node_diff_ys_ym : np.ndarray
+        Array of the difference between the stiffness center
         y-coordinate and node y-coordinates.
-    _node_EIx_proportion : pd.Series
-        Series representing the proportion of the total flexural stiffness
+    _node_EIx_proportion : np.ndarray
+        Array of the proportion of the total flexural stiffness
         along the x-axis for each node.
-    _node_EIy_proportion : pd.Series
-        Series representing the proportion of the total flexural stiffness
+    _node_EIy_proportion : np.ndarray
+        Array of the proportion of the total flexural stiffness
         along the y-axis for each node.
-    _global_EIw : pd.Series
-        Series representing the global warping stiffness.
-    _node_EIwx_proportion : pd.Series
-        Series representing the proportion of the torsional stiffness
+    _global_EIw : float
+        The global warping stiffness.
+    _node_EIwx_proportion : np.ndarray
+        Array of the proportion of the torsional stiffness
         contribution for each node along the x-axis.
-    _node_EIwy_proportion : pd.Series
-        Series representing the proportion of the torsional stiffness
+    _node_EIwy_proportion : np.ndarray
+        Array of the proportion of the torsional stiffness
         contribution for each node along the y-axis.
     _result_table : pd.DataFrame
         DataFrame containing various structural properties and node data.
+    _sums : np.ndarray
+        Running sums over all nodes (`_SUMS`, in coordinates local to the
+        mass centre) from which the totals, the stiffness centre and the
+        warping stiffness are derived. They are updated incrementally when
+        a node changes or is added, and recomputed from scratch when a node
+        is removed, every `_SUM_RESYNC_INTERVAL` updates and whenever an
+        update is large against the remaining sums.
+    _coupling_checked : bool
+        True once a solver ignoring `glob_kxy` has checked the nodes for it,
+        reset when a node is added or its `glob_kxy` is updated.
+    _cache : dict
+        Cache of the per-node derived quantities above. It is cleared
+        whenever a node's stiffness or position actually changes or a node
+        is added or removed; cached arrays are read-only.
     """  
+    _SUMS = kernel.SUMS
+    _SUM_RESYNC_INTERVAL = 1000
+    _SUM_RESYNC_RATIO = 0.5
+    # EIx, EIy, EIx*x^2 and EIy*y^2 sum non-negative terms, their size
+    # measures the cancellation in an update
+    _SUM_SCALES = [0, 1, 4, 5]
+
     def __init__(
             self,
             nodes:list[SupportNode],
-            glo_mass_centre:tuple[float, float]|np.ndarray,
+            glo_mass_centre:tuple[float, float]|np.ndarray|MassModel,
             verbose:bool=True
             ):
         
-        self._nodes = nodes
+        if isinstance(glo_mass_centre, MassModel):
+            glo_mass_centre = glo_mass_centre.massCentre()
+        self._nodes = list(nodes)
         self._glo_mass_centre_x, self._glo_mass_centre_y = glo_mass_centre
         self._verbose = verbose
-        self._linnodes = self._to_linear_nodes(deepcopy(nodes))
+        self._init_state()
 
 
-    def _to_linear_nodes(self, nodes:list[SupportNode]) -> list[SupportNode]:
+    def _linear_stiffness(
+            self,
+            node:SupportNode,
+            axis:str,
+            k:float|StiffnessCurve
+            ) -> float:
 
         MOMENTUM = 0
 
-        def printInfo(nr:int, axis:str, EI:float) -> None:
-            if self._verbose:
-                print(
-                    f"Info: node {nr} -> took EI{axis}(Mom={MOMENTUM}) "
-                    f"= {EI:,.1f} for linear solving"
-                    )
-
-        def extractStiffnessAtMomentZero(node:SupportNode) -> SupportNode:
-            if isinstance(node._glob_EIx, pd.DataFrame):
-                node._glob_EIx = interpolateXY(node._glob_EIx, MOMENTUM)
-                printInfo(node._nr, 'x', node._glob_EIx)
-            if isinstance(node._glob_EIy, pd.DataFrame):
-                node._glob_EIy = interpolateXY(node._glob_EIy, MOMENTUM)
-                printInfo(node._nr, 'y', node._glob_EIy)
-            return node
-        
-        return [extractStiffnessAtMomentZero(node) for node in nodes]
+        if not isinstance(k, StiffnessCurve):
+            return k
+
+        EI = k(MOMENTUM)
+        if self._verbose:
+            print(
+                f"Info: node {node._nr} -> took EI{axis}(Mom={MOMENTUM}) "
+                f"= {EI:,.1f} for linear solving"
+                )
+        return EI
     
 
+    def _init_state(self) -> None:
+        nodes = self._nodes
+        self._state_nr = np.array([node._nr for node in nodes])
+        self._state_x = np.array([node._glob_x for node in nodes], dtype=float)
+        self._state_y = np.array([node._glob_y for node in nodes], dtype=float)
+        self._state_EIx = np.array([
+            self._linear_stiffness(node, 'x', node._glob_EIx) for node in nodes
+            ], dtype=float)
+        self._state_EIy = np.array([
+            self._linear_stiffness(node, 'y', node._glob_EIy) for node in nodes
+            ], dtype=float)
+        self._state_Rx = np.array([node._Rx for node in nodes], dtype=float)
+        self._state_Ry = np.array([node._Ry for node in nodes], dtype=float)
+        self._linnodes = [LinearNode(self, i) for i in range(len(nodes))]
+        self._index_by_nr = None
+        self._coupling_checked = False
+        self._cache = {}
+        self._init_sums()
+
+
+    def _warn_decoupled(self, solver:str) -> None:
+        # the stiffness-centre solvers treat x and y separately, warn once
+        # per structure that they ignore the coupling stiffness
+        if self._coupling_checked:
+            return
+        self._coupling_checked = True
+        coupled = [node._nr for node in self._nodes if node._glob_EIxy != 0]
+        if coupled:
+            warnings.warn(
+                f"{solver} ignores the coupling stiffness glob_kxy of node(s) "
+                f"{coupled}, use MatrixSolve or CoupledBuilding to include it",
+                UserWarning,
+                stacklevel=3
+                )
+
+
+    def _copy(self) -> 'Stucture':
+        # input nodes and stiffness curves are shared, only the state is copied
+        new = copy(self)
+        for name in ('_state_x', '_state_y', '_state_EIx', '_state_EIy',
+                     '_state_Rx', '_state_Ry'):
+            setattr(new, name, getattr(self, name).copy())
+        new._nodes = list(self._nodes)
+        new._sums = self._sums.copy()
+        new._index_by_nr = None
+        new._linnodes = [LinearNode(new, i) for i in range(len(self._linnodes))]
+        new._cache = {}
+        return new
+
+
+    def _cached(
+            self,
+            key:str,
+            compute:Callable[[], np.ndarray|float]
+            ) -> np.ndarray|float:
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = compute()
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+            self._cache[key] = value
+            return value
+
+
+    def _contributions(
+            self,
+            x:np.ndarray|float,
+            y:np.ndarray|float,
+            EIx:np.ndarray|float,
+            EIy:np.ndarray|float
+            ) -> np.ndarray:
+        # summands of the totals, the stiffness centre and EIw, taken in
+        # coordinates local to the mass centre (order as in _SUMS)
+        return kernel.stiffness_moments(
+            x - self._glo_mass_centre_x,
+            y - self._glo_mass_centre_y,
+            EIx,
+            EIy
+            )
+
+
+    def _node_contribution(self, index:int) -> np.ndarray:
+        return self._contributions(
+            self._state_x[index],
+            self._state_y[index],
+            self._state_EIx[index],
+            self._state_EIy[index]
+            )
+
+
+    def _init_sums(self) -> None:
+        self._sums = self._contributions(
+            self._state_x, self._state_y, self._state_EIx, self._state_EIy
+            ).reshape(len(self._SUMS), -1).sum(axis=1)
+        self._sum_updates = 0
+
+
+    def _update_sums(self, delta:np.ndarray) -> None:
+        self._sums += delta
+        self._sum_updates += 1
+        # a change large against the remaining sums, e.g. of a dominant
+        # wall, leaves its round-off in the much smaller result
+        scales = self._SUM_SCALES
+        large = np.abs(delta[scales]) > self._SUM_RESYNC_RATIO * np.abs(self._sums[scales])
+        if self._sum_updates >= self._SUM_RESYNC_INTERVAL or large.any():
+            # bound the round-off accumulated by the incremental updates
+            self._init_sums()
+
+
+    def _change_node(self, index:int, changes:dict[str, float]) -> None:
+        if not changes:
+            return
+        old = self._node_contribution(index)
+        for name, value in changes.items():
+            getattr(self, f'_state_{name}')[index] = value
+        self._update_sums(self._node_contribution(index) - old)
+        self._cache.clear()
+
+
+    def _change_nodes(
+            self,
+            index:np.ndarray,
+            name:str,
+            values:np.ndarray
+            ) -> None:
+        state = getattr(self, f'_state_{name}')
+        changed = state[index] != values
+        if not changed.any():
+            return
+        index, values = index[changed], values[changed]
+
+        def contribution() -> np.ndarray:
+            return self._contributions(
+                self._state_x[index],
+                self._state_y[index],
+                self._state_EIx[index],
+                self._state_EIy[index]
+                ).sum(axis=1)
+
+        old = contribution()
+        state[index] = values
+        self._update_sums(contribution() - old)
+        self._cache.clear()
+
+
+    def _set_node_stiffnesses(
+            self,
+            index:np.ndarray,
+            EIx:np.ndarray|None=None,
+            EIy:np.ndarray|None=None
+            ) -> None:
+        # vectorized _set_node_stiffness for unique indices
+        if EIx is not None:
+            self._change_nodes(index, 'EIx', np.asarray(EIx, dtype=float))
+        if EIy is not None:
+            self._change_nodes(index, 'EIy', np.asarray(EIy, dtype=float))
+
+
+    def _set_node_stiffness(
+            self,
+            index:int,
+            EIx:float|None=None,
+            EIy:float|None=None
+            ) -> None:
+        changes = {}
+        if EIx is not None and EIx != self._state_EIx[index]:
+            changes['EIx'] = EIx
+        if EIy is not None and EIy != self._state_EIy[index]:
+            changes['EIy'] = EIy
+        self._change_node(index, changes)
+
+
+    def _set_node_position(
+            self,
+            index:int,
+            glob_x:float|None=None,
+            glob_y:float|None=None
+            ) -> None:
+        changes = {}
+        if glob_x is not None and glob_x != self._state_x[index]:
+            changes['x'] = glob_x
+        if glob_y is not None and glob_y != self._state_y[index]:
+            changes['y'] = glob_y
+        self._change_node(index, changes)
+
+
+    def _node_index(self, nr:int) -> int:
+        if self._index_by_nr is None:
+            self._index_by_nr = {}
+            for i, node_nr in enumerate(self._state_nr.tolist()):
+                self._index_by_nr.setdefault(node_nr, i)
+        try:
+            return self._index_by_nr[nr]
+        except KeyError:
+            raise KeyError(f'structure has no node {nr}') from None
+
+
+    def updateNode(
+            self,
+            nr:int,
+            glob_x:float|None=None,
+            glob_y:float|None=None,
+            glob_kx:float|StiffnessCurve|pd.DataFrame|None=None,
+            glob_ky:float|StiffnessCurve|pd.DataFrame|None=None,
+            glob_kxy:float|None=None
+            ) -> None:
+        """
+        Changes the position and/or stiffness of an existing node.
+
+        Arguments left as None keep their current value. The input node is
+        replaced by a new `SupportNode`, the one passed to the constructor
+        is not modified. The totals, the stiffness centre and the warping
+        stiffness are updated incrementally; per-node results are
+        recomputed on their next access.
+
+        Parameters
+        ----------
+        nr : int
+            Number of the node to change.
+        glob_x : float, optional
+            New global x-coordinate.
+        glob_y : float, optional
+            New global y-coordinate.
+        glob_kx : float, StiffnessCurve or pd.DataFrame, optional
+            New stiffness along the y-axis, see `SupportNode`.
+        glob_ky : float, StiffnessCurve or pd.DataFrame, optional
+            New stiffness along the x-axis, see `SupportNode`.
+        glob_kxy : float, optional
+            New coupling stiffness, see `SupportNode`.
+
+        Returns
+        -------
+        None
+        """
+        index = self._node_index(nr)
+        old = self._nodes[index]
+        node = SupportNode(
+            nr,
+            old._glob_x if glob_x is None else glob_x,
+            old._glob_y if glob_y is None else glob_y,
+            old._glob_EIy if glob_kx is None else glob_kx,
+            old._glob_EIx if glob_ky is None else glob_ky,
+            old._glob_EIxy if glob_kxy is None else glob_kxy,
+            )
+        self._nodes[index] = node
+        if glob_kxy is not None:
+            self._coupling_checked = False
+
+        changes = {
+            'x':float(node._glob_x),
+            'y':float(node._glob_y),
+            'EIx':float(self._linear_stiffness(node, 'x', node._glob_EIx)),
+            'EIy':float(self._linear_stiffness(node, 'y', node._glob_EIy)),
+        }
+        changes = {
+            name:value for name, value in changes.items()
+            if value != getattr(self, f'_state_{name}')[index]
+            }
+        self._change_node(index, changes)
+
+
+    def addNode(self, node:SupportNode) -> None:
+        """
+        Adds a support node to the structure.
+
+        Parameters
+        ----------
+        node : SupportNode
+            The node to add. Its number must not exist in the structure yet.
+
+        Returns
+        -------
+        None
+        """
+        if node._nr in self._state_nr:
+            raise ValueError(f'structure already has a node {node._nr}')
+
+        index = len(self._nodes)
+        self._nodes.append(node)
+        self._state_nr = np.append(self._state_nr, node._nr)
+        self._state_x = np.append(self._state_x, float(node._glob_x))
+        self._state_y = np.append(self._state_y, float(node._glob_y))
+        self._state_EIx = np.append(
+            self._state_EIx, self._linear_stiffness(node, 'x', node._glob_EIx)
+            )
+        self._state_EIy = np.append(
+            self._state_EIy, self._linear_stiffness(node, 'y', node._glob_EIy)
+            )
+        self._state_Rx = np.append(self._state_Rx, float(node._Rx))
+        self._state_Ry = np.append(self._state_Ry, float(node._Ry))
+        self._linnodes.append(LinearNode(self, index))
+        self._coupling_checked = False
+
+        if self._index_by_nr is not None:
+            self._index_by_nr[node._nr] = index
+        self._update_sums(self._node_contribution(index))
+        self._cache.clear()
+
+
+    def removeNode(self, nr:int) -> SupportNode:
+        """
+        Removes a support node from the structure.
+
+        Its `LinearNode` is detached from the structure, the views of the
+        other nodes stay valid.
+
+        Parameters
+        ----------
+        nr : int
+            Number of the node to remove.
+
+        Returns
+        -------
+        SupportNode
+            The removed input node.
+        """
+        index = self._node_index(nr)
+
+        node = self._nodes.pop(index)
+        for name in ('nr', 'x', 'y', 'EIx', 'EIy', 'Rx', 'Ry'):
+            state = f'_state_{name}'
+            setattr(self, state, np.delete(getattr(self, state), index))
+
+        # keep the views held elsewhere pointing at their node, a view of
+        # the removed node fails on access
+        removed = self._linnodes.pop(index)
+        removed._structure = removed._index = None
+        for linnode in self._linnodes[index:]:
+            linnode._index -= 1
+
+        self._index_by_nr = None
+        # subtracting the node could cancel most of the sums
+        self._init_sums()
+        self._cache.clear()
+        return node
+
+
+    def _set_reactions(self, Rx:np.ndarray, Ry:np.ndarray) -> None:
+        self._state_Rx[:] = Rx
+        self._state_Ry[:] = Ry
+
+
     @property
-    def _node_numbers(self) -> pd.Series:
-        return pd.Series([node._nr for node in self._linnodes])
+    def _node_numbers(self) -> np.ndarray:
+        return self._cached('node_numbers', self._state_nr.view)
     
     @property
-    def _glo_node_x(self) -> pd.Series:
-        return pd.Series([node._glob_x for node in self._linnodes])
+    def _glo_node_x(self) -> np.ndarray:
+        return self._cached('glo_node_x', self._state_x.view)
 
     @property
-    def _glo_node_y(self) -> pd.Series:
-        return pd.Series([node._glob_y for node in self._linnodes])
+    def _glo_node_y(self) -> np.ndarray:
+        return self._cached('glo_node_y', self._state_y.view)
     
     @property
-    def _loc_node_x(self) -> pd.Series:
-        return self._glo_node_x - self._glo_mass_centre_x
+    def _loc_node_x(self) -> np.ndarray:
+        return self._cached(
+            'loc_node_x',
+            lambda: self._state_x - self._glo_mass_centre_x
+            )
     
     @property
-    def _loc_node_y(self) -> pd.Series:
-        return self._glo_node_y - self._glo_mass_centre_y
+    def _loc_node_y(self) -> np.ndarray:
+        return self._cached(
+            'loc_node_y',
+            lambda: self._state_y - self._glo_mass_centre_y
+            )
 
     @property
-    def _node_EIy(self) -> pd.Series:
-        return pd.Series([node._glob_EIy for node in self._linnodes])
+    def _node_EIy(self) -> np.ndarray:
+        return self._cached('node_EIy', self._state_EIy.view)
     
     @property
-    def _node_EIx(self) -> pd.Series:
-        return pd.Series([node._glob_EIx for node in self._linnodes])
+    def _node_EIx(self) -> np.ndarray:
+        return self._cached('node_EIx', self._state_EIx.view)
+
+    @property
+    def _total_EIx(self) -> float:
+        return float(self._sums[0])
+
+    @property
+    def _total_EIy(self) -> float:
+        return float(self._sums[1])
     
     @property
     def _loc_stiff_centre_x(self) -> float:
-        x_xm = self._loc_node_x
-        EIx = self._node_EIx
-        return (EIx * x_xm).sum() / EIx.sum()
+        return float(kernel.stiffness_centre(self._sums)[0])
 
     @property
     def _loc_stiff_centre_y(self) -> float:
-        y_ym = self._loc_node_y
-        EIy = self._node_EIy
-        return (EIy * y_ym).sum() / EIy.sum()
+        return float(kernel.stiffness_centre(self._sums)[1])
 
     @property
     def _glo_stiff_centre_x(self) -> float:
@@ -152,37 +536,68 @@ class Stucture:
         return self._loc_stiff_centre_y + self._glo_mass_centre_y
 
     @property
-    def _loc_node_xs(self) -> pd.Series:
-        return self._glo_node_x - self._glo_stiff_centre_x
+    def _loc_node_xs(self) -> np.ndarray:
+        return self._cached(
+            'loc_node_xs',
+            lambda: self._state_x - self._glo_stiff_centre_x
+            )
     
     @property
-    def _loc_node_ys(self) -> pd.Series:
-        return self._glo_node_y - self._glo_stiff_centre_y
+    def _loc_node_ys(self) -> np.ndarray:
+        return self._cached(
+            'loc_node_ys',
+            lambda: self._state_y - self._glo_stiff_centre_y
+            )
     
     @property
-    def _node_EIx_proportion(self) -> pd.Series:
-        return self._node_EIy / self._node_EIy.sum()
+    def _node_EIx_proportion(self) -> np.ndarray:
+        return self._cached(
+            'node_EIx_proportion',
+            lambda: self._state_EIy / self._total_EIy
+            )
     
     @property
-    def _node_EIy_proportion(self) -> pd.Series:
-        return self._node_EIx / self._node_EIx.sum()
+    def _node_EIy_proportion(self) -> np.ndarray:
+        return self._cached(
+            'node_EIy_proportion',
+            lambda: self._state_EIx / self._total_EIx
+            )
     
     @property
-    def _global_EIw(self) -> pd.Series:
-        EIy = self._node_EIy
-        EIx = self._node_EIx
-        x = self._loc_node_xs
-        y = self._loc_node_ys
-        return (EIy*y**2 + EIx*x**2).sum()
+    def _global_EIw(self) -> float:
+        return float(kernel.warping_stiffness(self._sums))
     
     @property
-    def _node_EIwx_proportion(self) -> pd.Series:
-        return self._node_EIy * self._loc_node_ys / self._global_EIw
+    def _node_EIwx_proportion(self) -> np.ndarray:
+        return self._cached(
+            'node_EIwx_proportion',
+            lambda: self._state_EIy * self._loc_node_ys / self._global_EIw
+            )
     
     @property
-    def _node_EIwy_proportion(self) -> pd.Series:
-        return self._node_EIx * self._loc_node_xs / self._global_EIw
+    def _node_EIwy_proportion(self) -> np.ndarray:
+        return self._cached(
+            'node_EIwy_proportion',
+            lambda: self._state_EIx * self._loc_node_xs / self._global_EIw
+            )
     
+    def _distribute(
+            self,
+            x_mass_force:np.ndarray|float,
+            y_mass_force:np.ndarray|float
+            ) -> tuple[np.ndarray, np.ndarray]:
+        # nodal forces (Vx, Vy) of forces at the mass centre, see kernel.distribute
+        return kernel.distribute(
+            self._loc_node_x,
+            self._loc_node_y,
+            self._state_EIx,
+            self._state_EIy,
+            x_mass_force,
+            y_mass_force,
+            self._sums
+            )
+
+
     @property
     def _result_table(self) -> pd.DataFrame:
 
@@ -230,9 +645,9 @@ class Stucture:
             f"{self._loc_stiff_centre_x:0.4f}, "
             f"{self._loc_stiff_centre_y:0.4f}\n"
             f"EIx total               : "
-            f"{self._node_EIx.sum():,.1f}\n"
+            f"{self._total_EIx:,.1f}\n"
             f"EIy total               : "
-            f"{self._node_EIy.sum():,.1f}\n"
+            f"{self._total_EIy:,.1f}\n"
             f"EIw total               : "
             f"{self._global_EIw:,.1f}\n"
             f"\n{self._result_table}\n"
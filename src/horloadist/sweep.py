@@ -0,0 +1,278 @@
+import pandas as pd
+import numpy as np
+
+from .structure import Stucture
+from .stiffnesses import KX, KY
+from . import kernel
+
+
+class ParametricSweep:
+    """
+    A class to evaluate many variants of a floor plan at once.
+
+    Every node property is an array broadcastable to the shape
+    (*variants, nodes); the variant axes may also come from the mass centre
+    (*variants, 2) or the forces (*variants). The node properties need at
+    least the axis of the nodes, the variant axes may be empty: a single plan
+    is one variant without dim columns in the tables. The stiffness centre,
+    the warping stiffness and the nodal forces of all variants are computed
+    with broadcast NumPy operations, without building a `Stucture` or
+    `LinSolve` per variant.
+
+    Parameters
+    ----------
+    glob_x : array_like
+        Global x-coordinates of the nodes, broadcastable to (*variants, nodes).
+    glob_y : array_like
+        Global y-coordinates of the nodes, broadcastable to (*variants, nodes).
+    glob_kx : array_like
+        Stiffnesses along the y-axis (EIy), as `glob_kx` of `SupportNode`.
+    glob_ky : array_like
+        Stiffnesses along the x-axis (EIx), as `glob_ky` of `SupportNode`.
+    glo_mass_centre : array_like
+        The global mass centre (x, y), broadcastable to (*variants, 2).
+    x_mass_force : float or array_like, optional
+        The force in the x-direction at the mass centre, broadcastable to
+        (*variants) (default is 1).
+    y_mass_force : float or array_like, optional
+        The force in the y-direction at the mass centre, broadcastable to
+        (*variants) (default is 1).
+    node_numbers : array_like, optional
+        The node numbers, default is 1 to nodes.
+    dims : list of str, optional
+        Names of the variant axes used in `_table`, default is
+        'dim 0', 'dim 1', ...
+
+    Attributes
+    ----------
+    _shape : tuple of int
+        The shape of the variant axes.
+    _loc_stiff_centre_x : np.ndarray
+        Stiffness centre x-coordinates relative to the mass centre, shape
+        (*variants).
+    _loc_stiff_centre_y : np.ndarray
+        Stiffness centre y-coordinates relative to the mass centre, shape
+        (*variants).
+    _glo_stiff_centre_x : np.ndarray
+        Global stiffness centre x-coordinates, shape (*variants).
+    _glo_stiff_centre_y : np.ndarray
+        Global stiffness centre y-coordinates, shape (*variants).
+    _global_EIw : np.ndarray
+        The global warping stiffness, shape (*variants).
+    _torsion_Ts : np.ndarray
+        The torsion moment about the stiffness centre, shape (*variants).
+    _node_final_Vx : np.ndarray
+        Final nodal forces in the x-direction, shape (*variants, nodes).
+    _node_final_Vy : np.ndarray
+        Final nodal forces in the y-direction, shape (*variants, nodes).
+    _table : pd.DataFrame
+        Long-format DataFrame with one row per variant and node.
+    _variant_table : pd.DataFrame
+        DataFrame with one row per variant.
+    """
+    def __init__(
+            self,
+            glob_x:np.ndarray,
+            glob_y:np.ndarray,
+            glob_kx:np.ndarray,
+            glob_ky:np.ndarray,
+            glo_mass_centre:tuple[float, float]|np.ndarray,
+            x_mass_force:float|np.ndarray=1,
+            y_mass_force:float|np.ndarray=1,
+            node_numbers:np.ndarray|list[int]|None=None,
+            dims:list[str]|None=None
+            ) -> None:
+        x, y, EIy, EIx = np.broadcast_arrays(
+            *(np.asarray(a, dtype=float) for a in (glob_x, glob_y, glob_kx, glob_ky))
+            )
+        if x.ndim == 0:
+            raise ValueError('node properties need at least one axis for the nodes')
+        centre = np.asarray(glo_mass_centre, dtype=float)
+        Fx = np.asarray(x_mass_force, dtype=float)
+        Fy = np.asarray(y_mass_force, dtype=float)
+
+        # the variants may come from the nodes, the mass centre or the forces
+        self._shape = np.broadcast_shapes(x.shape[:-1], centre.shape[:-1], Fx.shape, Fy.shape)
+        n_nodes = x.shape[-1]
+        x, y, EIy, EIx = (np.broadcast_to(a, self._shape + (n_nodes,)) for a in (x, y, EIy, EIx))
+
+        centre = np.broadcast_to(centre, self._shape + (2,))
+        self._glo_mass_centre_x = centre[..., 0]
+        self._glo_mass_centre_y = centre[..., 1]
+        self._x_force = np.broadcast_to(Fx, self._shape)
+        self._y_force = np.broadcast_to(Fy, self._shape)
+
+        if node_numbers is None:
+            node_numbers = np.arange(1, n_nodes + 1)
+        self._node_numbers = np.asarray(node_numbers)
+        if self._node_numbers.shape != (n_nodes,):
+            raise ValueError(f'expected {n_nodes} node numbers, got {self._node_numbers.shape}')
+
+        if dims is None:
+            dims = [f'dim {i}' for i in range(len(self._shape))]
+        if len(dims) != len(self._shape):
+            raise ValueError(f'expected {len(self._shape)} dims, got {len(dims)}')
+        self._dims = list(dims)
+
+        self._glo_node_x, self._glo_node_y = x, y
+        self._node_EIx, self._node_EIy = EIx, EIy
+
+        self._main()
+
+
+    @classmethod
+    def rectangular(
+            cls,
+            glob_x:np.ndarray,
+            glob_y:np.ndarray,
+            dx_glob:np.ndarray,
+            dy_glob:np.ndarray,
+            glo_mass_centre:tuple[float, float]|np.ndarray,
+            E_mod:float|np.ndarray=1,
+            **kwargs
+            ) -> 'ParametricSweep':
+        """
+        Creates a sweep over rectangular walls.
+
+        The stiffnesses are computed with `KX.constRectangular` and
+        `KY.constRectangular` from the wall dimensions, which may be arrays
+        broadcastable to (*variants, nodes) like the coordinates.
+
+        Parameters
+        ----------
+        glob_x, glob_y : array_like
+            Global coordinates of the walls.
+        dx_glob, dy_glob : array_like
+            Wall dimensions in the x- and y-direction.
+        glo_mass_centre : array_like
+            The global mass centre (x, y).
+        E_mod : float or array_like, optional
+            Young's modulus (default is 1).
+        **kwargs
+            Further arguments of `ParametricSweep`.
+
+        Returns
+        -------
+        ParametricSweep
+        """
+        dx_glob = np.asarray(dx_glob, dtype=float)
+        dy_glob = np.asarray(dy_glob, dtype=float)
+        return cls(
+            glob_x,
+            glob_y,
+            KX.constRectangular(dx_glob, dy_glob, E_mod),
+            KY.constRectangular(dx_glob, dy_glob, E_mod),
+            glo_mass_centre,
+            **kwargs
+            )
+
+
+    @classmethod
+    def from_structure(
+            cls,
+            structure:Stucture,
+            glob_x:np.ndarray|None=None,
+            glob_y:np.ndarray|None=None,
+            glob_kx:np.ndarray|None=None,
+            glob_ky:np.ndarray|None=None,
+            glo_mass_centre:np.ndarray|None=None,
+            **kwargs
+            ) -> 'ParametricSweep':
+        """
+        Creates a sweep that varies some properties of an existing structure.
+
+        Properties left as None are taken from the linear state of the
+        structure.
+
+        Parameters
+        ----------
+        structure : Stucture
+            The structure providing the base values and the node numbers.
+        glob_x, glob_y, glob_kx, glob_ky, glo_mass_centre : array_like, optional
+            The varied properties, see `ParametricSweep`.
+        **kwargs
+            Further arguments of `ParametricSweep`.
+
+        Returns
+        -------
+        ParametricSweep
+        """
+        structure._warn_decoupled('ParametricSweep')
+
+        def base(value:np.ndarray|None, default:np.ndarray) -> np.ndarray:
+            return default if value is None else value
+
+        return cls(
+            base(glob_x, structure._glo_node_x),
+            base(glob_y, structure._glo_node_y),
+            base(glob_kx, structure._node_EIy),
+            base(glob_ky, structure._node_EIx),
+            base(glo_mass_centre, np.array([
+                structure._glo_mass_centre_x, structure._glo_mass_centre_y
+                ])),
+            node_numbers=structure._node_numbers,
+            **kwargs
+            )
+
+
+    def _main(self) -> None:
+        EIx, EIy = self._node_EIx, self._node_EIy
+        x = self._glo_node_x - self._glo_mass_centre_x[..., np.newaxis]
+        y = self._glo_node_y - self._glo_mass_centre_y[..., np.newaxis]
+
+        sums = kernel.stiffness_sums(x, y, EIx, EIy)
+        self._loc_stiff_centre_x, self._loc_stiff_centre_y = kernel.stiffness_centre(sums)
+        self._glo_stiff_centre_x = self._loc_stiff_centre_x + self._glo_mass_centre_x
+        self._glo_stiff_centre_y = self._loc_stiff_centre_y + self._glo_mass_centre_y
+        self._global_EIw = kernel.warping_stiffness(sums)
+
+        self._torsion_Ts = kernel.torsion(
+            self._x_force,
+            self._y_force,
+            self._loc_stiff_centre_x,
+            self._loc_stiff_centre_y
+            )
+        self._node_final_Vx, self._node_final_Vy = kernel.distribute(
+            x, y, EIx, EIy, self._x_force, self._y_force, sums
+            )
+
+
+    def _variant_index(self) -> dict[str, np.ndarray]:
+        # a single plan has no variant axes and no dim columns
+        if not self._shape:
+            return {}
+        n_variants = int(np.prod(self._shape))
+        return dict(zip(self._dims, np.unravel_index(np.arange(n_variants), self._shape)))
+
+
+    @property
+    def _variant_table(self) -> pd.DataFrame:
+
+        variant_table = {
+            **self._variant_index(),
+            'glo xs':self._glo_stiff_centre_x.ravel(),
+            'glo ys':self._glo_stiff_centre_y.ravel(),
+            'EIw':self._global_EIw.ravel(),
+            'Ts':self._torsion_Ts.ravel(),
+        }
+
+        return pd.DataFrame(variant_table)
+
+
+    @property
+    def _table(self) -> pd.DataFrame:
+        n_nodes = self._node_numbers.size
+        n_variants = int(np.prod(self._shape))
+
+        result_table = {
+            **{dim:np.repeat(idx, n_nodes) for dim, idx in self._variant_index().items()},
+            'node nr':np.tile(self._node_numbers, n_variants),
+            'glo x':self._glo_node_x.ravel(),
+            'glo y':self._glo_node_y.ravel(),
+            'EIx':self._node_EIx.ravel(),
+            'EIy':self._node_EIy.ravel(),
+            'Vx':self._node_final_Vx.ravel(),
+            'Vy':self._node_final_Vy.ravel(),
+        }
+
+        return pd.DataFrame(result_table)
@@ -1,13 +1,13 @@
-from scipy.interpolate import interp1d
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.axes as mpl_axes
-import matplotlib.figure as mpl_fig
-from datetime import datetime
+
+# scipy and matplotlib are imported where they are used, so that importing
+# horloadist (or this module) stays cheap for linear runs and short-lived
+# worker processes
 
 
 def interpolateXY(df:pd.DataFrame, Momentum:float|int) -> float:
+    from scipy.interpolate import interp1d
     
     x_val = df['mom']
     y_val = df['EI']
@@ -32,6 +32,10 @@ def plot_nlsolve(
         fname:str|None=None,
         format:str='pdf'
         ) -> None:
+    import matplotlib.pyplot as plt
+    import matplotlib.axes as mpl_axes
+    import matplotlib.figure as mpl_fig
+    from datetime import datetime
 
     fig, axes = plt.subplots(2, 2, figsize=(10, 10))
     fig:mpl_fig.Figure = fig
@@ -0,0 +1,284 @@
+import pandas as pd
+import os
+from typing import Iterator
+
+
+FORMATS = ('parquet', 'arrow', 'csv')
+
+_SUFFIXES = {'parquet':'.parquet', 'arrow':'.arrow', 'csv':'.csv'}
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow
+    except ImportError:
+        return False
+    return True
+
+
+def _require_pyarrow(fmt:str) -> None:
+    if not _has_pyarrow():
+        raise ImportError(
+            f"format '{fmt}' needs pyarrow, install it with 'pip install pyarrow' "
+            f"or use format='csv'"
+            )
+
+
+def _default_format() -> str:
+    return 'parquet' if _has_pyarrow() else 'csv'
+
+
+def _infer_format(path:str, fmt:str|None) -> str:
+    if fmt is None:
+        for name, suffix in _SUFFIXES.items():
+            if path.endswith(suffix):
+                return name
+        return _default_format()
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format '{fmt}', choose from {list(FORMATS)}")
+    return fmt
+
+
+def _part_files(path:str, fmt:str) -> list[str]:
+    suffix = _SUFFIXES[fmt]
+    if not os.path.isdir(path):
+        return []
+    return sorted(
+        os.path.join(path, name) for name in os.listdir(path)
+        if name.startswith('part-') and name.endswith(suffix)
+        )
+
+
+def _next_part_index(parts:list[str], fmt:str) -> int:
+    # one past the highest number, parts may have been deleted in between
+    suffix = _SUFFIXES[fmt]
+    numbers = [
+        os.path.basename(part)[len('part-'):-len(suffix)] for part in parts
+        ]
+    return max((int(number) + 1 for number in numbers if number.isdigit()), default=0)
+
+
+class ResultWriter:
+    """
+    A class to stream result tables to disk chunk by chunk.
+
+    Each call of `write` appends one chunk, so batch runs never have to
+    hold more than one chunk in memory. Parquet and Arrow IPC need pyarrow;
+    without it CSV is used as the default.
+
+    - 'parquet' and 'arrow': `path` is a directory. Every writer writes one
+      part file `part-NNNNN` into it, every chunk becomes one row group or
+      record batch. Appending adds a new part file.
+    - 'csv': `path` is a single file. Appending continues the file.
+
+    All chunks written to one path must have the same columns.
+
+    Parameters
+    ----------
+    path : str
+        The output directory (parquet, arrow) or file (csv).
+    format : str, optional
+        'parquet', 'arrow' or 'csv'. By default it is inferred from the
+        suffix of `path`, falling back to parquet if pyarrow is installed
+        and csv otherwise.
+    append : bool, optional
+        If False, existing results at `path` are replaced (default is False).
+
+    Attributes
+    ----------
+    _path : str
+        The output directory or file.
+    _format : str
+        The output format.
+    _rows : int
+        The number of rows written by this writer.
+    _chunks : int
+        The number of chunks written by this writer.
+    """
+    def __init__(
+            self,
+            path:str,
+            format:str|None=None,
+            append:bool=False
+            ) -> None:
+        self._path = os.fspath(path)
+        self._format = _infer_format(self._path, format)
+        self._append = append
+        self._rows = 0
+        self._chunks = 0
+        self._sink = None
+        self._schema = None
+
+        if self._format != 'csv':
+            _require_pyarrow(self._format)
+        self._prepare_path()
+
+
+    def _prepare_path(self) -> None:
+        if self._format == 'csv':
+            if not self._append and os.path.exists(self._path):
+                os.remove(self._path)
+            return
+
+        os.makedirs(self._path, exist_ok=True)
+        parts = _part_files(self._path, self._format)
+        if not self._append:
+            for part in parts:
+                os.remove(part)
+            parts = []
+        self._part_path = os.path.join(
+            self._path,
+            f'part-{_next_part_index(parts, self._format):05d}{_SUFFIXES[self._format]}'
+            )
+
+
+    def _open_sink(self, table) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._schema = table.schema
+        if self._format == 'parquet':
+            self._sink = pq.ParquetWriter(self._part_path, self._schema)
+        else:
+            self._sink = pa.ipc.new_file(self._part_path, self._schema)
+
+
+    def write(self, table:pd.DataFrame, **columns) -> None:
+        """
+        Appends a chunk of results.
+
+        Parameters
+        ----------
+        table : pd.DataFrame
+            The chunk to write, e.g. the `_table` of a solver. The index is
+            not written, use `table.reset_index()` to keep it.
+        **columns
+            Constant columns added in front of the chunk, e.g. `case=3`.
+
+        Returns
+        -------
+        None
+        """
+        if columns:
+            table = pd.concat(
+                [pd.DataFrame(columns, index=table.index), table], axis=1
+                )
+
+        if self._format == 'csv':
+            header = not os.path.exists(self._path) or os.path.getsize(self._path) == 0
+            table.to_csv(self._path, mode='a', header=header, index=False)
+        else:
+            import pyarrow as pa
+
+            if self._sink is None:
+                chunk = pa.Table.from_pandas(table, preserve_index=False)
+                self._open_sink(chunk)
+            else:
+                chunk = pa.Table.from_pandas(
+                    table, schema=self._schema, preserve_index=False
+                    )
+            self._sink.write_table(chunk)
+
+        self._rows += len(table)
+        self._chunks += 1
+
+
+    def close(self) -> None:
+        """
+        Finishes the current part file.
+
+        Returns
+        -------
+        None
+        """
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+
+    def __enter__(self) -> 'ResultWriter':
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+    @staticmethod
+    def read(
+            path:str,
+            format:str|None=None,
+            columns:list[str]|None=None,
+            chunksize:int=100_000
+            ) -> Iterator[pd.DataFrame]:
+        """
+        Reads results written by `ResultWriter` lazily, chunk by chunk.
+
+        Parameters
+        ----------
+        path : str
+            The directory (parquet, arrow) or file (csv) written to.
+        format : str, optional
+            The format, inferred like in `ResultWriter` if not given.
+        columns : list of str, optional
+            Read only these columns.
+        chunksize : int, optional
+            Rows per chunk for csv; parquet and arrow yield their row groups
+            and record batches as written (default is 100000).
+
+        Yields
+        ------
+        pd.DataFrame
+        """
+        path = os.fspath(path)
+        fmt = _infer_format(path, format)
+
+        if fmt == 'csv':
+            yield from pd.read_csv(path, usecols=columns, chunksize=chunksize)
+            return
+
+        _require_pyarrow(fmt)
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        for part in _part_files(path, fmt):
+            if fmt == 'parquet':
+                parquet_file = pq.ParquetFile(part)
+                for i in range(parquet_file.num_row_groups):
+                    yield parquet_file.read_row_group(i, columns=columns).to_pandas()
+            else:
+                with pa.memory_map(part) as source:
+                    reader = pa.ipc.open_file(source)
+                    for i in range(reader.num_record_batches):
+                        batch = reader.get_batch(i)
+                        if columns is not None:
+                            batch = batch.select(columns)
+                        yield batch.to_pandas()
+
+
+    @staticmethod
+    def readAll(
+            path:str,
+            format:str|None=None,
+            columns:list[str]|None=None
+            ) -> pd.DataFrame:
+        """
+        Reads all results written to `path` into one DataFrame.
+
+        Parameters
+        ----------
+        path : str
+            The directory (parquet, arrow) or file (csv) written to.
+        format : str, optional
+            The format, inferred like in `ResultWriter` if not given.
+        columns : list of str, optional
+            Read only these columns.
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        chunks = list(ResultWriter.read(path, format, columns))
+        if not chunks:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(chunks, ignore_index=True)